@@ -1,15 +1,9 @@
-import api from './axios';
+import { getAllPages } from './pagination';
 
 export const getMyAttendance = async () => {
-    const response = await api.get('attendance/');
-    return response.data;
+    return getAllPages('attendance/');
 };
 
 export const getPastEvents = async (type) => {
-    let url = 'events/?time=past';
-    if (type) {
-        url += `&type=${type}`;
-    }
-    const response = await api.get(url);
-    return response.data;
+    return getAllPages('events/', type ? { time: 'past', type } : { time: 'past' });
 };
@@ -1,6 +1,21 @@
 import api from './axios';
+import { getAllPages } from './pagination';
 
 export const getAllEvents = async () => {
-    const response = await api.get('events/');
+    return getAllPages('events/');
+};
+
+// Events with start <= event_date < end, following every page
+export const getEventsInRange = async (start, end) => {
+    return getAllPages('events/', {
+        start: start.toISOString(),
+        end: end.toISOString(),
+        page_size: 200,
+    });
+};
+
+// Private .ics subscription URL for calendar apps
+export const getCalendarFeed = async (type) => {
+    const response = await api.get('events/calendar/', { params: type ? { type } : {} });
     return response.data;
 };
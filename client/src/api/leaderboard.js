@@ -4,3 +4,12 @@ export const getLeaderboard = async (period = 'all_time') => {
     const response = await api.get(`leaderboard/?period=${period}&limit=50`);
     return response.data;
 };
+
+// Entries just above and below the current user, optionally within a
+// segment such as { batch_year: 2026 } or { skill_level: 'expert' }
+export const getLeaderboardAroundMe = async (window = 5, segment = {}) => {
+    const response = await api.get('leaderboard/', {
+        params: { around: 'me', window, ...segment },
+    });
+    return response.data;
+};
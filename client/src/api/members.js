@@ -1,6 +1,5 @@
-import api from './axios';
+import { getAllPages } from './pagination';
 
 export const getMembers = async () => {
-    const response = await api.get('users/');
-    return response.data;
+    return getAllPages('users/');
 };
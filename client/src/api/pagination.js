@@ -0,0 +1,16 @@
+import api from './axios';
+
+// Every item of a list endpoint, following the cursor `next` links
+export const getAllPages = async (url, params) => {
+    const items = [];
+    while (url) {
+        const response = await api.get(url, { params });
+        if (!Array.isArray(response.data.results)) {
+            return response.data; // not paginated
+        }
+        items.push(...response.data.results);
+        url = response.data.next;
+        params = undefined; // the next link carries them
+    }
+    return items;
+};
@@ -1,4 +1,5 @@
 import api from './axios';
+import { getAllPages } from './pagination';
 
 // Get current user profile
 export const getProfile = async () => {
@@ -14,6 +15,5 @@ export const updateProfile = async (data) => {
 
 // Get projects for a specific user
 export const getUserProjects = async (userId) => {
-    const response = await api.get(`users/${userId}/projects/`);
-    return response.data;
+    return getAllPages(`users/${userId}/projects/`);
 };
@@ -1,8 +1,8 @@
 import api from './axios';
+import { getAllPages } from './pagination';
 
 export const getProjects = async () => {
-    const response = await api.get('projects/');
-    return response.data;
+    return getAllPages('projects/');
 };
 
 export const getProject = async (id) => {
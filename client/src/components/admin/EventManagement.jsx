@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '../../api/axios';
+import { getAllPages } from '../../api/pagination';
 import { Search, Edit, Trash2, Plus, Calendar, MapPin, Users } from 'lucide-react';
 
 const EventManagement = () => {
@@ -32,8 +33,7 @@ const EventManagement = () => {
     const fetchEvents = async () => {
         setLoading(true);
         try {
-            const response = await api.get('/events/');
-            setEvents(response.data.results || response.data);
+            setEvents(await getAllPages('/events/'));
         } catch (error) {
             console.error('Failed to fetch events', error);
         } finally {
@@ -43,8 +43,7 @@ const EventManagement = () => {
 
     const fetchUsers = async () => {
         try {
-            const response = await api.get('/users/');
-            setUsers(response.data.results || response.data);
+            setUsers(await getAllPages('/users/'));
         } catch (error) {
             console.error('Failed to fetch users', error);
         }
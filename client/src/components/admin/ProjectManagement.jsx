@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '../../api/axios';
+import { getAllPages } from '../../api/pagination';
 import { Search, Edit, Trash2, Plus, Github, ExternalLink } from 'lucide-react';
 
 const ProjectManagement = () => {
@@ -26,8 +27,7 @@ const ProjectManagement = () => {
     const fetchProjects = async () => {
         setLoading(true);
         try {
-            const response = await api.get('/projects/');
-            setProjects(response.data.results || response.data);
+            setProjects(await getAllPages('/projects/'));
         } catch (error) {
             console.error(error);
         } finally {
@@ -37,8 +37,7 @@ const ProjectManagement = () => {
 
     const fetchUsers = async () => {
         try {
-            const response = await api.get('/users/');
-            setUsers(response.data.results || response.data);
+            setUsers(await getAllPages('/users/'));
         } catch (error) {
             console.error(error);
         }
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '../../api/axios';
+import { getAllPages } from '../../api/pagination';
 import { Search, Edit, Trash2, Plus, CheckCircle } from 'lucide-react';
 
 const TaskManagement = () => {
@@ -25,8 +26,7 @@ const TaskManagement = () => {
     const fetchTasks = async () => {
         setLoading(true);
         try {
-            const response = await api.get('/tasks/');
-            setTasks(response.data.results || response.data);
+            setTasks(await getAllPages('/tasks/'));
         } catch (error) {
             console.error(error);
         } finally {
@@ -36,8 +36,7 @@ const TaskManagement = () => {
 
     const fetchUsers = async () => {
         try {
-            const response = await api.get('/users/');
-            setUsers(response.data.results || response.data);
+            setUsers(await getAllPages('/users/'));
         } catch (error) {
             console.error(error);
         }
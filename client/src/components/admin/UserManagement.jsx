@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '../../api/axios';
+import { getAllPages } from '../../api/pagination';
 import { Search, Edit, Trash2, UserPlus, Check, X } from 'lucide-react';
 
 const UserManagement = () => {
@@ -25,8 +26,7 @@ const UserManagement = () => {
     const fetchUsers = async () => {
         setLoading(true);
         try {
-            const response = await api.get('/users/', { params: { search } });
-            setUsers(response.data.results || response.data);
+            setUsers(await getAllPages('/users/', { search }));
         } catch (error) {
             console.error('Failed to fetch users', error);
         } finally {
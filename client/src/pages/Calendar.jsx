@@ -3,7 +3,7 @@ import {
     ChevronLeft, ChevronRight, Calendar as CalendarIcon, Clock, MoreHorizontal,
     X, MapPin, Users, AlignLeft, Search, HelpCircle, Settings, Menu
 } from 'lucide-react';
-import { getAllEvents } from '../api/events';
+import { getAllEvents, getEventsInRange } from '../api/events';
 
 // --- Modal Components ---
 
@@ -85,11 +85,30 @@ const Calendar = () => {
     const [isSearchOpen, setIsSearchOpen] = useState(false);
     const [loading, setLoading] = useState(true);
 
+    // Date range shown by the current view; the agenda lists everything
+    const getVisibleRange = () => {
+        const year = currentDate.getFullYear();
+        const month = currentDate.getMonth();
+        const date = currentDate.getDate();
+        if (view === 'month') return [new Date(year, month, 1), new Date(year, month + 1, 1)];
+        if (view === 'week') {
+            const start = new Date(year, month, date - currentDate.getDay());
+            return [start, new Date(start.getFullYear(), start.getMonth(), start.getDate() + 7)];
+        }
+        if (view === 'day') return [new Date(year, month, date), new Date(year, month, date + 1)];
+        return null;
+    };
+    const [rangeStart, rangeEnd] = (getVisibleRange() || [null, null]).map(d => d && d.getTime());
+
     useEffect(() => {
+        let cancelled = false;
         const fetchEvents = async () => {
             setLoading(true);
             try {
-                const data = await getAllEvents();
+                const data = rangeStart !== null
+                    ? await getEventsInRange(new Date(rangeStart), new Date(rangeEnd))
+                    : await getAllEvents();
+                if (cancelled) return;
                 // Map backend data to calendar format
                 const mappedEvents = data.map(event => {
                     const dateObj = new Date(event.event_date);
@@ -109,11 +128,13 @@ const Calendar = () => {
             } catch (err) {
                 console.error("Failed to load events", err);
             } finally {
-                setLoading(false);
+                if (!cancelled) setLoading(false);
             }
         };
         fetchEvents();
-    }, []);
+        // Ignore a slow response for a range the user has already left
+        return () => { cancelled = true; };
+    }, [rangeStart, rangeEnd]);
 
     // Helpers
     const getDaysInMonth = (date) => {
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, Event, Attendance, Task
+from .models import Project, Event, Attendance, Task, PointsLedger
 
 
 @admin.register(Task)
@@ -33,3 +33,18 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ["title", "event_type", "event_date", "location", "created_at"]
     list_filter = ["event_type", "event_date"]
     search_fields = ["title", "description"]
+
+
+@admin.register(PointsLedger)
+class PointsLedgerAdmin(admin.ModelAdmin):
+    list_display = ["user", "points", "source_type", "source_id", "created_at"]
+    list_filter = ["source_type", "created_at"]
+    search_fields = ["user__username"]
+    readonly_fields = [
+        "user",
+        "source_type",
+        "source_id",
+        "points",
+        "awarded_by",
+        "created_at",
+    ]
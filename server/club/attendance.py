@@ -0,0 +1,173 @@
+"""
+Set-based attendance marking.
+
+`bulk_mark_attendance` validates every user id in one query and writes all
+rows with a single INSERT ... ON CONFLICT (user, event) DO UPDATE, inside one
+transaction. `check_in_attendance` is its insert-only counterpart for self
+check-in: ON CONFLICT DO NOTHING, so a status an admin already set is kept.
+bulk_create skips post_save, so the side effects the signal handlers in
+club.signals apply to single rows are applied here in bulk.
+"""
+
+import csv
+import io
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from config.cache import bump_version
+
+from . import dashboard
+from .models import Attendance, Event
+from .points import ATTENDANCE_POINTS, award_points_bulk
+
+User = get_user_model()
+
+# CSV columns that can identify a user, in order of preference
+CSV_USER_COLUMNS = ("user_id", "id", "username", "email", "student_id")
+
+
+class CSVError(ValueError):
+    pass
+
+
+def read_user_csv(upload):
+    """
+    Resolve users listed in an uploaded CSV file.
+    Returns (user_ids, unknown) where `unknown` are identifiers that did not
+    match any user. Each lookup column costs one query.
+    """
+    try:
+        text = upload.read().decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise CSVError("CSV file must be UTF-8 encoded") from exc
+
+    reader = csv.DictReader(io.StringIO(text))
+    header = {name.strip().lower(): name for name in reader.fieldnames or []}
+    column = next((c for c in CSV_USER_COLUMNS if c in header), None)
+    if column is None:
+        raise CSVError("CSV needs a header with one of: " + ", ".join(CSV_USER_COLUMNS))
+
+    values = [
+        row[header[column]].strip() for row in reader if row[header[column]].strip()
+    ]
+    if column in ("user_id", "id"):
+        return values, []
+
+    lookup = f"{column}__in"
+    found = dict(User.objects.filter(**{lookup: values}).values_list(column, "id"))
+    user_ids = [found[value] for value in values if value in found]
+    unknown = [value for value in values if value not in found]
+    return user_ids, unknown
+
+
+def _valid_user_ids(user_ids):
+    """(valid, invalid): known user ids, deduplicated, and everything else."""
+    requested, invalid = [], []
+    for user_id in user_ids:
+        try:
+            requested.append(int(user_id))
+        except (TypeError, ValueError):
+            invalid.append(user_id)
+    requested = list(dict.fromkeys(requested))
+
+    valid = set(User.objects.filter(pk__in=requested).values_list("id", flat=True))
+    invalid += [user_id for user_id in requested if user_id not in valid]
+    return [user_id for user_id in requested if user_id in valid], invalid
+
+
+def bulk_mark_attendance(event, user_ids, status, marked_by):
+    """
+    Mark `user_ids` with `status` at `event`, creating or updating rows.
+    Returns a dict of created, updated and invalid user ids.
+    """
+    user_ids, invalid = _valid_user_ids(user_ids)
+    if not user_ids:
+        return {"created": [], "updated": [], "invalid": invalid}
+
+    with transaction.atomic():
+        existing = set(
+            Attendance.objects.filter(event=event, user_id__in=user_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+        Attendance.objects.bulk_create(
+            [
+                Attendance(
+                    user_id=user_id, event=event, status=status, marked_by=marked_by
+                )
+                for user_id in user_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "event"],
+            update_fields=["status", "marked_by"],
+        )
+        if status == "present":
+            _award_present(event, user_ids, marked_by)
+        _touch_event(event, user_ids)
+
+    return {
+        "created": [user_id for user_id in user_ids if user_id not in existing],
+        "updated": [user_id for user_id in user_ids if user_id in existing],
+        "invalid": invalid,
+    }
+
+
+def check_in_attendance(event, user_ids):
+    """
+    Mark `user_ids` present at `event` where they have no row yet. Existing
+    rows, e.g. an admin's "absent" or "excused", are left as they are, and
+    only the rows created here earn attendance points.
+    Returns the ids of the users checked in.
+    """
+    user_ids, _ = _valid_user_ids(user_ids)
+    if not user_ids:
+        return []
+
+    with transaction.atomic():
+        existing = set(
+            Attendance.objects.filter(event=event, user_id__in=user_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+        user_ids = [user_id for user_id in user_ids if user_id not in existing]
+        if not user_ids:
+            return []
+        # A row marked between the check above and here is kept as it is
+        Attendance.objects.bulk_create(
+            [
+                Attendance(user_id=user_id, event=event, status="present")
+                for user_id in user_ids
+            ],
+            ignore_conflicts=True,
+        )
+        # The ledger awards each attendance row at most once, so a row an
+        # admin created in the meantime isn't awarded twice
+        _award_present(event, user_ids, marked_by=None)
+        _touch_event(event, user_ids)
+
+    return user_ids
+
+
+def _award_present(event, user_ids, marked_by):
+    present = Attendance.objects.filter(
+        event=event, user_id__in=user_ids, status="present"
+    ).values_list("user_id", "id")
+    award_points_bulk(
+        present,
+        ATTENDANCE_POINTS,
+        source_type="attendance",
+        awarded_by_id=marked_by.pk if marked_by else None,
+    )
+
+
+def _touch_event(event, user_ids):
+    Event.objects.filter(pk=event.pk).update(updated_at=timezone.now())
+    transaction.on_commit(lambda: _invalidate_caches(user_ids))
+
+
+def _invalidate_caches(user_ids):
+    bump_version("events")
+    dashboard.invalidate_events()
+    dashboard.invalidate_users(user_ids, attendance=True)
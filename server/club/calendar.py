@@ -0,0 +1,143 @@
+"""
+iCalendar (.ics) feed of club events.
+
+Calendar apps can't log in, so each member subscribes with a private URL
+holding a signed token for their user (see `make_feed_token`). The token
+embeds the user's session auth hash, so changing the password revokes old
+feed URLs. `?type=workshop` narrows a feed to one event type.
+
+The feed covers events from CALENDAR_FEED_PAST_DAYS ago onwards and is
+streamed row by row from a `.values()` iterator, so its size doesn't grow
+the worker's memory. Responses carry an ETag from the same cheap aggregate
+as the JSON API (config.conditional) and a max-age, so polling clients
+mostly get 304s.
+"""
+
+from datetime import UTC, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+
+from .models import Event
+
+SIGNING_SALT = "club.calendar"
+
+# Events have no end time; the client also shows them as one hour long
+EVENT_DURATION = timedelta(hours=1)
+
+User = get_user_model()
+
+
+def _password_stamp(user):
+    # Enough of the hash to notice a password change; the token is signed
+    return user.get_session_auth_hash()[:16]
+
+
+def make_feed_token(user):
+    return signing.dumps(
+        {"u": user.pk, "pwd": _password_stamp(user)}, salt=SIGNING_SALT
+    )
+
+
+def read_feed_token(token):
+    """
+    The active user a feed token was issued to.
+    Raises signing.BadSignature if it is forged or has been revoked.
+    """
+    claims = signing.loads(token, salt=SIGNING_SALT)
+    user = User.objects.filter(pk=claims.get("u"), is_active=True).first()
+    if user is None or _password_stamp(user) != claims.get("pwd"):
+        raise signing.BadSignature("Feed token has been revoked")
+    return user
+
+
+def feed_events(event_type=None):
+    """The events a feed lists, oldest first."""
+    since = timezone.now() - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS)
+    events = Event.objects.filter(event_date__gte=since)
+    if event_type:
+        events = events.filter(event_type=event_type)
+    return events.order_by("event_date", "pk")
+
+
+def escape(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)."""
+    return (
+        (text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1), CRLF-terminated."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Don't split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value):
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def stream_feed(events, name, host):
+    """Yield the calendar for `events` a few lines at a time."""
+    labels = dict(Event.EVENT_TYPE_CHOICES)
+    yield "".join(
+        fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//NST SDC//Portal//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape(name)}",
+            f"REFRESH-INTERVAL;VALUE=DURATION:PT{settings.CALENDAR_FEED_MAX_AGE}S",
+            f"X-PUBLISHED-TTL:PT{settings.CALENDAR_FEED_MAX_AGE}S",
+        )
+    )
+
+    columns = (
+        "id",
+        "title",
+        "description",
+        "event_type",
+        "event_date",
+        "location",
+        "meeting_link",
+        "updated_at",
+    )
+    for event in events.values(*columns).iterator(chunk_size=500):
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:event-{event['id']}@{host}",
+            f"DTSTAMP:{format_datetime(event['updated_at'])}",
+            f"LAST-MODIFIED:{format_datetime(event['updated_at'])}",
+            f"DTSTART:{format_datetime(event['event_date'])}",
+            f"DTEND:{format_datetime(event['event_date'] + EVENT_DURATION)}",
+            f"SUMMARY:{escape(event['title'])}",
+            f"DESCRIPTION:{escape(event['description'])}",
+            f"LOCATION:{escape(event['location'])}",
+            "CATEGORIES:"
+            + escape(labels.get(event["event_type"], event["event_type"])),
+        ]
+        if event["meeting_link"]:
+            lines.append(f"URL:{event['meeting_link']}")
+        lines.append("END:VEVENT")
+        yield "".join(fold(line) for line in lines)
+
+    yield fold("END:VCALENDAR")
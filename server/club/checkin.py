@@ -0,0 +1,145 @@
+"""
+Self check-in for events.
+
+Admins display a short-lived signed code for an event (e.g. as a QR code).
+Members post it back; the signature and age are checked without touching the
+database, and the check-in is queued in a per-process write-behind buffer.
+The buffer is flushed to Attendance with one set-based insert per event
+(see club.attendance.check_in_attendance) once it holds CHECKIN_FLUSH_SIZE check-ins or after
+CHECKIN_FLUSH_INTERVAL seconds, whichever comes first.
+
+Check-ins are idempotent per (user, event): duplicates are dropped in the
+buffer and the insert skips users who already have a row, so a status an
+admin set first (e.g. "excused") is never overwritten. Check-ins whose insert
+fails stay buffered and are retried on a timer that backs off from
+CHECKIN_FLUSH_INTERVAL up to MAX_RETRY_DELAY seconds. A check-in that is
+still buffered when the process is killed hard is lost; buffers are flushed
+at normal interpreter exit.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+from .attendance import check_in_attendance
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+SIGNING_SALT = "club.checkin"
+
+# Longest wait between retries of a failing flush, in seconds
+MAX_RETRY_DELAY = 60
+
+
+def make_checkin_code(event):
+    """A signed code for `event`, valid for CHECKIN_CODE_MAX_AGE seconds."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(str(event.pk))
+
+
+def read_checkin_code(code):
+    """
+    Return the event id a code was issued for.
+    Raises signing.BadSignature (or SignatureExpired) if it is forged or stale.
+    """
+    value = signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+        code, max_age=settings.CHECKIN_CODE_MAX_AGE
+    )
+    return int(value)
+
+
+class CheckInBuffer:
+    """Thread-safe, deduplicating buffer of pending (event, user) check-ins."""
+
+    def __init__(self, flush_size, flush_interval):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._count = 0
+        self._timer = None
+        self._failures = 0
+
+    def add(self, event_id, user_id):
+        with self._lock:
+            users = self._pending.setdefault(event_id, set())
+            if user_id in users:
+                return
+            users.add(user_id)
+            self._count += 1
+            full = self._count >= self.flush_size
+            if not full:
+                self._schedule(self.flush_interval)
+        if full:
+            # Flush off the request thread so check-ins never wait on the DB
+            threading.Thread(target=self._flush_later, daemon=True).start()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending, self._count = self._pending, {}, 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return
+        try:
+            # Events deleted since their code was issued would fail every retry
+            live = set(
+                Event.objects.filter(pk__in=pending).values_list("id", flat=True)
+            )
+        except Exception:
+            logger.exception("Check-in flush failed")
+            self._retry(pending)
+            return
+
+        failed = {}
+        for event_id, user_ids in pending.items():
+            if event_id not in live:
+                logger.warning("Dropping check-ins for missing event %s", event_id)
+                continue
+            try:
+                check_in_attendance(Event(pk=event_id), list(user_ids))
+            except Exception:
+                logger.exception("Check-in flush failed for event %s", event_id)
+                failed[event_id] = user_ids
+        if failed:
+            self._retry(failed)
+        else:
+            with self._lock:
+                self._failures = 0
+
+    def _retry(self, failed):
+        """Put `failed` back and flush again after a growing delay."""
+        with self._lock:
+            for event_id, user_ids in failed.items():
+                self._pending.setdefault(event_id, set()).update(user_ids)
+                self._count += len(user_ids)
+            delay = min(self.flush_interval * 2**self._failures, MAX_RETRY_DELAY)
+            self._failures += 1
+            self._schedule(delay)
+
+    def _schedule(self, delay):
+        # Called with the lock held; a timer that is already set stays
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connections; don't leak them
+            connections.close_all()
+
+
+buffer = CheckInBuffer(
+    flush_size=settings.CHECKIN_FLUSH_SIZE,
+    flush_interval=settings.CHECKIN_FLUSH_INTERVAL,
+)
+atexit.register(buffer.flush)
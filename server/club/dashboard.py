@@ -0,0 +1,105 @@
+"""
+Cached fragments for the dashboard endpoint.
+
+Upcoming events and recent projects are the same for every user, so they are
+cached once. Active tasks and the attendance count are cached per user. Every
+fragment is dropped by the signal handlers in club.signals when the rows it
+was built from change, and also expires after DASHBOARD_CACHE_TIMEOUT.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Attendance, Event, Project, Task
+from .serializers import EventSerializer, ProjectSerializer, TaskSerializer
+
+UPCOMING_EVENTS_KEY = "dashboard:upcoming_events"
+RECENT_PROJECTS_KEY = "dashboard:recent_projects"
+
+
+def active_tasks_key(user_id):
+    return f"dashboard:user:{user_id}:active_tasks"
+
+
+def attendance_count_key(user_id):
+    return f"dashboard:user:{user_id}:attendance_count"
+
+
+def get_upcoming_events():
+    data = cache.get(UPCOMING_EVENTS_KEY)
+    if data is None:
+        now = timezone.now()
+        events = list(
+            Event.objects.with_attendance_count()
+            .filter(event_date__gte=now)
+            .order_by("event_date")[:5]
+        )
+        data = EventSerializer(events, many=True).data
+
+        # Don't keep serving an event after it has started
+        timeout = settings.DASHBOARD_CACHE_TIMEOUT
+        if events:
+            starts_in = (events[0].event_date - now).total_seconds()
+            timeout = max(1, min(timeout, int(starts_in)))
+        cache.set(UPCOMING_EVENTS_KEY, data, timeout)
+    return data
+
+
+def get_recent_projects():
+    data = cache.get(RECENT_PROJECTS_KEY)
+    if data is None:
+        projects = (
+            Project.objects.with_contributor_count()
+            .select_related("lead")
+            .prefetch_related("contributors")
+            .order_by("-created_at")[:5]
+        )
+        data = ProjectSerializer(projects, many=True).data
+        cache.set(RECENT_PROJECTS_KEY, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def get_active_tasks(user):
+    key = active_tasks_key(user.pk)
+    data = cache.get(key)
+    if data is None:
+        tasks = (
+            Task.objects.filter(assigned_to=user, status__in=["pending", "in_progress"])
+            .select_related("assigned_to")
+            .order_by("due_date")
+        )
+        data = TaskSerializer(tasks, many=True).data
+        cache.set(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def get_attendance_count(user):
+    key = attendance_count_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Attendance.objects.filter(user=user, status="present").count()
+        cache.set(key, count, settings.DASHBOARD_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_events():
+    cache.delete(UPCOMING_EVENTS_KEY)
+
+
+def invalidate_projects():
+    cache.delete(RECENT_PROJECTS_KEY)
+
+
+def invalidate_user(user_id, tasks=False, attendance=False):
+    invalidate_users([user_id], tasks=tasks, attendance=attendance)
+
+
+def invalidate_users(user_ids, tasks=False, attendance=False):
+    keys = []
+    for user_id in user_ids:
+        if tasks:
+            keys.append(active_tasks_key(user_id))
+        if attendance:
+            keys.append(attendance_count_key(user_id))
+    cache.delete_many(keys)
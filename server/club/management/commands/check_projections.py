@@ -0,0 +1,110 @@
+import time
+import tracemalloc
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from club.projections import (
+    AttendanceProjection,
+    EventProjection,
+    ProjectProjection,
+    TaskProjection,
+)
+from club.serializers import (
+    AttendanceSerializer,
+    EventSerializer,
+    ProjectSerializer,
+    TaskSerializer,
+)
+from club.views import AttendanceViewSet, EventViewSet, ProjectViewSet, TaskViewSet
+
+# (name, list queryset, ordering, serializer, projection)
+CASES = [
+    (
+        "projects",
+        ProjectViewSet.queryset,
+        "-created_at",
+        ProjectSerializer,
+        ProjectProjection,
+    ),
+    ("events", EventViewSet.queryset, "-event_date", EventSerializer, EventProjection),
+    (
+        "attendance",
+        AttendanceViewSet.queryset,
+        "-marked_at",
+        AttendanceSerializer,
+        AttendanceProjection,
+    ),
+    ("tasks", TaskViewSet.queryset, "-created_at", TaskSerializer, TaskProjection),
+]
+
+
+def render_with_serializer(serializer_class, queryset, context):
+    data = serializer_class(queryset.all(), many=True, context=context).data
+    return JSONRenderer().render(data)
+
+
+def render_with_projection(projection_class, queryset, context):
+    projection = projection_class(context)
+    rows = list(projection.values(queryset.all()))
+    return JSONRenderer().render(projection.serialize(rows))
+
+
+def measure(render, repeat):
+    """Best wall time (ms) and peak allocation (KiB) of `render()`."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        render()
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the speed and allocations of the list projections in "
+        "club.projections with their serializers on the current data "
+        "(club.tests checks that their output matches)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=1000, help="Rows serialized per endpoint"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per path (best is kept)"
+        )
+
+    def handle(self, *args, **options):
+        context = {"request": RequestFactory().get("/")}
+
+        self.stdout.write(
+            f"{'endpoint':<12} {'rows':>6} {'serializer ms':>14} {'projection ms':>14}"
+            f" {'speedup':>8} {'serializer KiB':>15} {'projection KiB':>15}"
+        )
+        for name, queryset, ordering, serializer_class, projection_class in CASES:
+            page = queryset.all().order_by(ordering, "-pk")[: options["limit"]]
+            with_serializer = partial(
+                render_with_serializer, serializer_class, page, context
+            )
+            with_projection = partial(
+                render_with_projection, projection_class, page, context
+            )
+
+            rows = page.count()
+            serializer_ms, serializer_kib = measure(with_serializer, options["repeat"])
+            projection_ms, projection_kib = measure(with_projection, options["repeat"])
+            speedup = serializer_ms / projection_ms if projection_ms else 0
+            self.stdout.write(
+                f"{name:<12} {rows:>6} {serializer_ms:>14.1f} {projection_ms:>14.1f}"
+                f" {speedup:>7.1f}x {serializer_kib:>15.0f} {projection_kib:>15.0f}"
+            )
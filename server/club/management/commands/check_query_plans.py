@@ -0,0 +1,151 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from club.models import Event
+
+User = get_user_model()
+
+# Tables that grow with club activity; a full scan of these is a bug
+LARGE_TABLES = {
+    "club_attendance",
+    "club_task",
+    "club_event",
+    "club_project",
+    "club_pointsledger",
+    "club_dailypoints",
+}
+
+# Endpoints whose queries must not scan a large table. "{event}" is
+# replaced with the newest event's id.
+ENDPOINTS = [
+    "/api/dashboard/",
+    "/api/projects/?status=in_progress",
+    "/api/events/?time=upcoming",
+    "/api/events/?start=2025-01-01&end=2025-02-01",
+    "/api/events/{event}/attendees/",
+    "/api/attendance/?event={event}",
+    "/api/tasks/?status=submitted",
+    "/api/auth/profile/",
+    "/api/projects/",
+    "/api/events/",
+    "/api/attendance/",
+    "/api/tasks/",
+]
+
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?! VIRTUAL)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def explain(sql):
+    """The plan for `sql` as one string per line."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Small tables are cheaper to scan; ask whether an index exists
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def scanned_tables(plan):
+    pattern = POSTGRES_SCAN if connection.vendor == "postgresql" else SQLITE_SCAN
+    return {match for line in plan for match in pattern.findall(line)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the hot API endpoints, EXPLAIN every query they make and fail "
+        "if any of them scans a large table instead of using an index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Username to make the requests as (default: a non-admin member)",
+        )
+        parser.add_argument(
+            "--admin",
+            help="Username for the admin views of the list endpoints "
+            "(default: the first club admin)",
+        )
+        parser.add_argument(
+            "--verbose-plans", action="store_true", help="Print every query plan"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            raise CommandError(
+                "Query plans can only be checked on PostgreSQL or SQLite"
+            )
+
+        member = self.get_user(options["user"], is_member=True, is_club_admin=False)
+        admin = self.get_user(options["admin"], is_club_admin=True)
+        event = Event.objects.order_by("-event_date").first()
+        if event is None:
+            raise CommandError("Create at least one event first")
+
+        failures = []
+        # Dummy cache so every request reaches the database
+        with override_settings(
+            ALLOWED_HOSTS=["testserver"],
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            },
+        ):
+            for user in (member, admin):
+                client = APIClient()
+                client.force_authenticate(user)
+                for url in ENDPOINTS:
+                    failures += self.check_endpoint(
+                        client,
+                        url.format(event=event.pk),
+                        user,
+                        verbose=options["verbose_plans"],
+                    )
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} queries scan large tables:\n" + "\n".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("No hot query scans a large table"))
+
+    def get_user(self, username, **filters):
+        users = User.objects.filter(is_active=True)
+        user = (
+            users.filter(username=username).first()
+            if username
+            else users.filter(**filters).order_by("pk").first()
+        )
+        if user is None:
+            raise CommandError(f"No user found for {username or filters}")
+        return user
+
+    def check_endpoint(self, client, url, user, verbose):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        if response.status_code != 200:
+            return [f"{url} as {user}: HTTP {response.status_code}"]
+
+        failures = []
+        for query in queries.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            plan = explain(sql)
+            if verbose:
+                self.stdout.write(
+                    f"{url} as {user}:\n  {sql}\n    " + "\n    ".join(plan)
+                )
+            scans = scanned_tables(plan) & LARGE_TABLES
+            if scans:
+                failures.append(
+                    f"{url} as {user} scans {', '.join(sorted(scans))}:\n  {sql}"
+                )
+        self.stdout.write(f"{url} as {user}: {len(queries)} queries checked")
+        return failures
@@ -0,0 +1,175 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:41
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Sum, Window
+from django.db.models.functions import Rank
+
+# club.points.ATTENDANCE_POINTS at the time of this migration
+ATTENDANCE_POINTS = 5
+
+
+def backfill_ledger(apps, schema_editor):
+    """
+    Record awards that predate the ledger so they can't be awarded twice.
+    Verified task points are already in User.points. Attendance never
+    awarded points before, so past present rows are awarded now, at the
+    same rate as new ones, and the leaderboard is re-ranked to match.
+    """
+    Task = apps.get_model("club", "Task")
+    Attendance = apps.get_model("club", "Attendance")
+    PointsLedger = apps.get_model("club", "PointsLedger")
+    User = apps.get_model("users", "User")
+
+    entries = [
+        PointsLedger(
+            user_id=user_id, source_type="task", source_id=task_id, points=points
+        )
+        for task_id, user_id, points in Task.objects.filter(
+            status="verified"
+        ).values_list("id", "assigned_to_id", "points")
+    ]
+    attended = Counter()
+    for attendance_id, user_id in Attendance.objects.filter(
+        status="present"
+    ).values_list("id", "user_id"):
+        attended[user_id] += 1
+        entries.append(
+            PointsLedger(
+                user_id=user_id,
+                source_type="attendance",
+                source_id=attendance_id,
+                points=ATTENDANCE_POINTS,
+            )
+        )
+    PointsLedger.objects.bulk_create(entries, batch_size=1000)
+
+    by_count = {}
+    for user_id, count in attended.items():
+        by_count.setdefault(count, []).append(user_id)
+    for count, user_ids in by_count.items():
+        User.objects.filter(pk__in=user_ids).update(
+            points=F("points") + ATTENDANCE_POINTS * count
+        )
+    if attended:
+        rerank_leaderboard(apps)
+
+
+def unaward_attendance(apps, schema_editor):
+    """
+    Take attendance points back out of User.points before the ledger goes:
+    without it attendance awards nothing, and migrating forwards again
+    awards every present row anew.
+    """
+    PointsLedger = apps.get_model("club", "PointsLedger")
+    User = apps.get_model("users", "User")
+
+    awarded = (
+        PointsLedger.objects.filter(source_type="attendance")
+        .values("user_id")
+        .annotate(total=Sum("points"))
+        .values_list("user_id", "total")
+    )
+    by_total = {}
+    for user_id, total in awarded:
+        by_total.setdefault(total, []).append(user_id)
+    for total, user_ids in by_total.items():
+        User.objects.filter(pk__in=user_ids).update(points=F("points") - total)
+    if by_total:
+        rerank_leaderboard(apps)
+
+
+def rerank_leaderboard(apps):
+    """users.ranking.rebuild_leaderboard, against the historical models."""
+    User = apps.get_model("users", "User")
+    LeaderboardEntry = apps.get_model("users", "LeaderboardEntry")
+
+    ranked = (
+        User.objects.filter(is_active=True, is_member=True)
+        .annotate(rank=Window(expression=Rank(), order_by=F("points").desc()))
+        .values_list("id", "points", "rank", "batch_year", "skill_level")
+    )
+    entries = [
+        LeaderboardEntry(
+            user_id=user_id,
+            points=points,
+            rank=rank,
+            batch_year=batch_year,
+            skill_level=skill_level,
+        )
+        for user_id, points, rank, batch_year, skill_level in ranked
+    ]
+    LeaderboardEntry.objects.all().delete()
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("club", "0003_alter_project_tech_stack"),
+        ("users", "0003_leaderboard_segments"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PointsLedger",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source_type",
+                    models.CharField(
+                        choices=[("task", "Task"), ("attendance", "Attendance")],
+                        max_length=20,
+                    ),
+                ),
+                ("source_id", models.PositiveBigIntegerField()),
+                ("points", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "awarded_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="points_awards",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created_at"],
+                        name="club_points_user_id_afbc31_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source_type", "source_id"),
+                        name="unique_award_per_source",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, unaward_attendance),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:42
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+# club.points.ATTENDANCE_POINTS at the time of this migration
+ATTENDANCE_POINTS = 5
+
+
+def backfill_daily_points(apps, schema_editor):
+    """Roll up historical verified tasks and attendance by day."""
+    Task = apps.get_model("club", "Task")
+    Attendance = apps.get_model("club", "Attendance")
+    DailyPoints = apps.get_model("club", "DailyPoints")
+
+    totals = Counter()
+    task_days = (
+        Task.objects.filter(status="verified")
+        .annotate(day=TruncDate("updated_at"))
+        .values_list("assigned_to_id", "day")
+        .annotate(total=Sum("points"))
+    )
+    for user_id, day, total in task_days:
+        totals[user_id, day] += total
+
+    attendance_days = (
+        Attendance.objects.filter(status="present")
+        .annotate(day=TruncDate("marked_at"))
+        .values_list("user_id", "day")
+        .annotate(total=Count("id"))
+    )
+    for user_id, day, total in attendance_days:
+        totals[user_id, day] += total * ATTENDANCE_POINTS
+
+    DailyPoints.objects.bulk_create(
+        [
+            DailyPoints(user_id=user_id, day=day, points=points)
+            for (user_id, day), points in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("club", "0004_pointsledger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPoints",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("points", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_points",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(
+                        fields=["day", "user", "points"],
+                        name="club_dailyp_day_b40bb1_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "day"), name="unique_user_day"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_points, migrations.RunPython.noop),
+    ]
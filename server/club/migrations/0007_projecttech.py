@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS club_project_tech_stack_gin ON club_project"
+            " USING gin (tech_stack jsonb_path_ops)"
+        )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS club_project_tech_stack_gin")
+
+
+def backfill_tags(apps, schema_editor):
+    # The side table is only read where JSON containment is unavailable
+    if schema_editor.connection.features.supports_json_field_contains:
+        return
+    Owner = apps.get_model("club", "Project")
+    Tag = apps.get_model("club", "ProjectTech")
+    Tag.objects.bulk_create(
+        [
+            Tag(project_id=pk, name=name)
+            for pk, names in Owner.objects.values_list("pk", "tech_stack")
+            for name in set(names or [])
+            if isinstance(name, str)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("club", "0006_event_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectTech",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tech_tags",
+                        to="club.project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["name", "project"], name="club_projec_name_88ec58_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "name"), name="unique_project_tech"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("club", "0008_event_banner_renditions_project_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["event_date"], name="club_event_event_d_c67a75_idx"
+            ),
+        ),
+    ]
@@ -3,6 +3,24 @@ from django.conf import settings
 from django.utils import timezone
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_contributor_count(self):
+        """Annotate each project with its number of contributors."""
+        return self.annotate(
+            contributor_total=models.Count("contributors", distinct=True)
+        )
+
+
+class EventQuerySet(models.QuerySet):
+    def with_attendance_count(self):
+        """Annotate each event with its number of present attendees."""
+        return self.annotate(
+            present_total=models.Count(
+                "attendances", filter=models.Q(attendances__status="present")
+            )
+        )
+
+
 class Project(models.Model):
     """
     Project model for dev club projects.
@@ -26,6 +44,8 @@ class Project(models.Model):
     demo_url = models.URLField(blank=True, null=True)
 
     image = models.ImageField(upload_to="project_images/", blank=True, null=True)
+    # Resized copies of the image (see config.images)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     # Team
     lead = models.ForeignKey(
@@ -42,6 +62,14 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),  # List and dashboard order
+            models.Index(fields=["status", "created_at"]),  # ?status= lists
+        ]
+
     def __str__(self):
         return self.name
 
@@ -71,11 +99,19 @@ class Event(models.Model):
     meeting_link = models.URLField(blank=True, null=True)
 
     banner = models.ImageField(upload_to="event_banners/", blank=True, null=True)
+    # Resized copies of the banner (see config.images)
+    banner_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ["-event_date"]
+        indexes = [
+            models.Index(fields=["event_date"]),  # Ordering, upcoming, ?start=&end=
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.event_date.date()})"
@@ -115,6 +151,17 @@ class Attendance(models.Model):
 
     class Meta:
         unique_together = ["user", "event"]
+        indexes = [
+            models.Index(fields=["event", "status"]),  # Present count per event
+            models.Index(fields=["user", "marked_at"]),  # A member's attendance
+            models.Index(fields=["marked_at"]),  # Admin attendance list
+            # A member's present count (dashboard, profile)
+            models.Index(
+                fields=["user"],
+                condition=models.Q(status="present"),
+                name="attendance_present_user_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} at {self.event}"
@@ -152,5 +199,126 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["assigned_to", "created_at"]),  # A member's tasks
+            models.Index(fields=["status", "created_at"]),  # ?status= review queues
+            models.Index(fields=["created_at"]),  # Admin task list
+            # Dashboard: a member's open tasks by due date
+            models.Index(
+                fields=["assigned_to", "due_date"],
+                condition=models.Q(status__in=["pending", "in_progress"]),
+                name="task_open_due_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.assigned_to}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # The assignee as loaded, so a reassignment can refresh both members
+        # (see club.signals)
+        task.loaded_assigned_to_id = task.__dict__.get("assigned_to_id")
+        return task
+
+
+class PointsLedger(models.Model):
+    """
+    Append-only record of every points award.
+    Each source (a verified task, a present attendance) can award at most once,
+    which the unique constraint enforces even under concurrent requests.
+    """
+
+    SOURCE_CHOICES = [
+        ("task", "Task"),
+        ("attendance", "Attendance"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="points_awards"
+    )
+
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+
+    points = models.IntegerField()
+
+    awarded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_type", "source_id"], name="unique_award_per_source"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} +{self.points} ({self.source_type} #{self.source_id})"
+
+
+class DailyPoints(models.Model):
+    """
+    Per-user, per-day points rollup maintained alongside the PointsLedger.
+    Period leaderboards sum at most one row per user per day in the range.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="daily_points"
+    )
+
+    day = models.DateField()
+
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_user_day"),
+        ]
+        indexes = [
+            # Covers range scans by day for period leaderboards
+            models.Index(fields=["day", "user", "points"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.day}: {self.points}"
+
+
+class ProjectTech(models.Model):
+    """
+    One row per Project.tech_stack entry, for databases without JSON
+    containment (see config.tags). Maintained by club.signals.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="tech_tags"
+    )
+
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "name"], name="unique_project_tech"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["name", "project"]),  # ?tech= lookups
+        ]
+
+    def __str__(self):
+        return f"{self.project}: {self.name}"
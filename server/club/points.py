@@ -0,0 +1,172 @@
+"""
+Points awarding backed by the PointsLedger.
+
+Awards are idempotent per source and never read-modify-write User.points:
+the ledger row and a conditional `UPDATE ... SET points = points + n` commit
+together, so concurrent awards neither lose updates nor double count.
+"""
+
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from config.cache import bump_version
+from jobs.queue import job
+from users.ranking import rebuild_leaderboard, sync_user_rank
+
+from .models import DailyPoints, PointsLedger
+
+User = get_user_model()
+
+# Points granted for being marked present at an event
+ATTENDANCE_POINTS = 5
+
+# Bulk awards touching more users than this rebuild the leaderboard instead
+# of shifting ranks one user at a time
+RANK_REBUILD_THRESHOLD = 25
+
+
+def _refresh_rank(user_id):
+    sync_user_rank(user_id)
+    bump_version("leaderboard")
+
+
+def _add_daily_points(user_id, points, day):
+    """Increment the user's rollup row for `day`, creating it if needed."""
+    rollup = DailyPoints.objects.filter(user_id=user_id, day=day)
+    if rollup.update(points=F("points") + points):
+        return
+    try:
+        with transaction.atomic():
+            DailyPoints.objects.create(user_id=user_id, day=day, points=points)
+    except IntegrityError:
+        # Another award created the row first
+        rollup.update(points=F("points") + points)
+
+
+def _insert_once(entry):
+    """Save a new ledger entry; False if its source was already awarded."""
+    try:
+        with transaction.atomic():
+            entry.save(force_insert=True)
+    except IntegrityError:
+        return False
+    return True
+
+
+def award_points(user_id, points, source_type, source_id, awarded_by_id=None):
+    """
+    Award `points` to `user_id` for a task or attendance record.
+    Returns the new ledger entry, or None if that source was already awarded.
+    """
+    with transaction.atomic():
+        entry = PointsLedger(
+            user_id=user_id,
+            source_type=source_type,
+            source_id=source_id,
+            points=points,
+            awarded_by_id=awarded_by_id,
+        )
+        if not _insert_once(entry):
+            return None
+
+        User.objects.filter(pk=user_id).update(
+            points=F("points") + points, updated_at=timezone.now()
+        )
+        _add_daily_points(user_id, points, timezone.localdate(entry.created_at))
+        # update() skips post_save, which would bump the namespace
+        bump_version("users")
+
+        # Rank shifts touch many rows; run them after the award has committed
+        # so parallel awards don't serialize on the leaderboard table.
+        transaction.on_commit(lambda: _refresh_rank(user_id))
+
+    return entry
+
+
+def award_points_bulk(awards, points, source_type, awarded_by_id=None):
+    """
+    Award the same `points` for many `(user_id, source_id)` pairs at once.
+    Sources already in the ledger are skipped, including ones a concurrent
+    award inserts first. Returns the number of awards.
+    """
+    awards = {source_id: user_id for user_id, source_id in awards}
+    if not awards:
+        return 0
+
+    with transaction.atomic():
+        already = set(
+            PointsLedger.objects.filter(
+                source_type=source_type, source_id__in=awards
+            ).values_list("source_id", flat=True)
+        )
+        entries = [
+            PointsLedger(
+                user_id=user_id,
+                source_type=source_type,
+                source_id=source_id,
+                points=points,
+                awarded_by_id=awarded_by_id,
+            )
+            for source_id, user_id in awards.items()
+            if source_id not in already
+        ]
+        try:
+            with transaction.atomic():
+                PointsLedger.objects.bulk_create(entries)
+        except IntegrityError:
+            # Another award took some of these sources since the check above;
+            # insert one at a time so only the rest are awarded here
+            entries = [entry for entry in entries if _insert_once(entry)]
+        if not entries:
+            return 0
+
+        # Group users by how many awards they receive, one UPDATE per group
+        per_user = Counter(entry.user_id for entry in entries)
+        by_count = {}
+        for user_id, count in per_user.items():
+            by_count.setdefault(count, []).append(user_id)
+
+        now = timezone.now()
+        today = timezone.localdate(now)
+        for count, user_ids in by_count.items():
+            User.objects.filter(pk__in=user_ids).update(
+                points=F("points") + points * count, updated_at=now
+            )
+            rollups = DailyPoints.objects.filter(user_id__in=user_ids, day=today)
+            rolled = set(rollups.values_list("user_id", flat=True))
+            rollups.update(points=F("points") + points * count)
+            DailyPoints.objects.bulk_create(
+                [
+                    DailyPoints(user_id=user_id, day=today, points=points * count)
+                    for user_id in user_ids
+                    if user_id not in rolled
+                ]
+            )
+
+        bump_version("users")
+        transaction.on_commit(lambda: _refresh_ranks(list(per_user)))
+
+    return len(entries)
+
+
+@job(unique=True)
+def rebuild_ranks():
+    """Rebuild the whole leaderboard, off the request path."""
+    rebuild_leaderboard()
+    bump_version("leaderboard")
+
+
+def _refresh_ranks(user_ids):
+    # Past a handful of users one windowed rebuild beats per-user rank shifts
+    if len(user_ids) > RANK_REBUILD_THRESHOLD:
+        # Period standings and points already changed; don't keep serving
+        # them until the queued rebuild runs
+        bump_version("leaderboard")
+        rebuild_ranks.delay()
+    else:
+        for user_id in user_ids:
+            _refresh_rank(user_id)
@@ -0,0 +1,219 @@
+"""
+List projections (see config.projections) matching the serializers in
+club.serializers. Nested users (UserMinimalSerializer) are loaded for a
+whole page in one query and shared between the rows that reference them.
+"""
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from config.images import srcset
+from config.projections import Projection, choice_labels, to_datetime
+
+from .models import Attendance, Event, Project, Task
+
+User = get_user_model()
+
+USER_COLUMNS = (
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "avatar",
+    "avatar_renditions",
+    "email",
+)
+
+
+class ClubProjection(Projection):
+    def user_details(self, user_ids):
+        """{id: UserMinimalSerializer data} for `user_ids`."""
+        ids = {pk for pk in user_ids if pk is not None}
+        if not ids:
+            return {}
+        return {
+            row["id"]: self.user(row)
+            for row in User.objects.filter(pk__in=ids).values(*USER_COLUMNS)
+        }
+
+    def user(self, row):
+        full_name = f"{row['first_name']} {row['last_name']}".strip()
+        return {
+            "id": row["id"],
+            "username": row["username"],
+            "full_name": full_name or row["username"],
+            "avatar": self.file_url(User, "avatar", row["avatar"]),
+            "avatar_srcset": srcset(row["avatar_renditions"], self.request),
+            "email": row["email"],
+        }
+
+
+class ProjectProjection(ClubProjection):
+    columns = (
+        "id",
+        "name",
+        "description",
+        "status",
+        "tech_stack",
+        "github_repo",
+        "demo_url",
+        "image",
+        "image_renditions",
+        "lead_id",
+        "contributor_total",
+        "created_at",
+        "updated_at",
+    )
+    status_labels = choice_labels(Project, "status")
+
+    def serialize(self, rows):
+        # Same query and order as prefetch_related("contributors")
+        contributors = {row["id"]: [] for row in rows}
+        for row in User.objects.filter(
+            contributed_projects__in=list(contributors)
+        ).values("contributed_projects", *USER_COLUMNS):
+            contributors[row.pop("contributed_projects")].append(self.user(row))
+        leads = self.user_details(row["lead_id"] for row in rows)
+
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "status": row["status"],
+                "status_display": self.status_labels.get(row["status"], row["status"]),
+                "tech_stack": row["tech_stack"],
+                "github_repo": row["github_repo"],
+                "demo_url": row["demo_url"],
+                "image": self.file_url(Project, "image", row["image"]),
+                "image_srcset": srcset(row["image_renditions"], self.request),
+                "lead": row["lead_id"],
+                "lead_details": leads.get(row["lead_id"]),
+                "contributors": [user["id"] for user in contributors[row["id"]]],
+                "contributors_details": contributors[row["id"]],
+                "contributor_count": row["contributor_total"],
+                "created_at": to_datetime(row["created_at"]),
+                "updated_at": to_datetime(row["updated_at"]),
+            }
+            for row in rows
+        ]
+
+
+class EventProjection(ClubProjection):
+    columns = (
+        "id",
+        "title",
+        "description",
+        "event_type",
+        "event_date",
+        "location",
+        "meeting_link",
+        "banner",
+        "banner_renditions",
+        "present_total",
+        "created_at",
+    )
+    event_type_labels = choice_labels(Event, "event_type")
+
+    def serialize(self, rows):
+        now = timezone.now()
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "event_type": row["event_type"],
+                "event_type_display": self.event_type_labels.get(
+                    row["event_type"], row["event_type"]
+                ),
+                "event_date": to_datetime(row["event_date"]),
+                "location": row["location"],
+                "meeting_link": row["meeting_link"],
+                "banner": self.file_url(Event, "banner", row["banner"]),
+                "banner_srcset": srcset(row["banner_renditions"], self.request),
+                "is_past": row["event_date"] < now,
+                "attendance_count": row["present_total"],
+                "created_at": to_datetime(row["created_at"]),
+            }
+            for row in rows
+        ]
+
+
+class AttendanceProjection(ClubProjection):
+    columns = (
+        "id",
+        "user_id",
+        "event_id",
+        "event__title",
+        "event__event_date",
+        "event__event_type",
+        "marked_by_id",
+        "marked_at",
+        "status",
+    )
+    status_labels = choice_labels(Attendance, "status")
+
+    def serialize(self, rows):
+        users = self.user_details(
+            pk for row in rows for pk in (row["user_id"], row["marked_by_id"])
+        )
+        return [
+            {
+                "id": row["id"],
+                "user": row["user_id"],
+                "user_details": users.get(row["user_id"]),
+                "event": row["event_id"],
+                "event_details": {
+                    "id": row["event_id"],
+                    "title": row["event__title"],
+                    "event_date": row["event__event_date"],
+                    "event_type": row["event__event_type"],
+                },
+                "marked_by": row["marked_by_id"],
+                "marked_by_details": users.get(row["marked_by_id"]),
+                "marked_at": to_datetime(row["marked_at"]),
+                "status": row["status"],
+                "status_display": self.status_labels.get(row["status"], row["status"]),
+            }
+            for row in rows
+        ]
+
+
+class TaskProjection(ClubProjection):
+    columns = (
+        "id",
+        "title",
+        "description",
+        "assigned_to_id",
+        "status",
+        "points",
+        "due_date",
+        "submission_link",
+        "created_at",
+        "updated_at",
+    )
+    status_labels = choice_labels(Task, "status")
+
+    def serialize(self, rows):
+        now = timezone.now()
+        users = self.user_details(row["assigned_to_id"] for row in rows)
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "assigned_to": row["assigned_to_id"],
+                "assigned_to_details": users.get(row["assigned_to_id"]),
+                "status": row["status"],
+                "status_display": self.status_labels.get(row["status"], row["status"]),
+                "points": row["points"],
+                "due_date": to_datetime(row["due_date"]),
+                "submission_link": row["submission_link"],
+                "is_overdue": bool(row["due_date"])
+                and row["status"] not in ("verified", "submitted")
+                and row["due_date"] < now,
+                "created_at": to_datetime(row["created_at"]),
+                "updated_at": to_datetime(row["updated_at"]),
+            }
+            for row in rows
+        ]
@@ -1,28 +1,34 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+
+from config.images import SrcsetField
+from config.sparse import SparseFieldsMixin
 from .models import Task, Event, Attendance, Project
 
 User = get_user_model()
 
 
-class UserMinimalSerializer(serializers.ModelSerializer):
+class UserMinimalSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Minimal user info for nested serializers"""
 
     full_name = serializers.CharField(source="get_full_name", read_only=True)
+    avatar_srcset = SrcsetField(source="avatar_renditions")
 
     class Meta:
         model = User
-        fields = ["id", "username", "full_name", "avatar", "email"]
+        fields = ["id", "username", "full_name", "avatar", "avatar_srcset", "email"]
         read_only_fields = fields
+        field_columns = {"full_name": ("first_name", "last_name", "username")}
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     lead_details = UserMinimalSerializer(source="lead", read_only=True)
     contributors_details = UserMinimalSerializer(
         source="contributors", many=True, read_only=True
     )
     contributor_count = serializers.SerializerMethodField()
     status_display = serializers.CharField(source="get_status_display", read_only=True)
+    image_srcset = SrcsetField(source="image_renditions")
 
     class Meta:
         model = Project
@@ -36,6 +42,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             "github_repo",
             "demo_url",
             "image",
+            "image_srcset",
             "lead",
             "lead_details",
             "contributors",
@@ -45,8 +52,14 @@ class ProjectSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        expandable = {"lead": "lead_details", "contributors": "contributors_details"}
+        field_columns = {"status_display": ("status",), "contributor_count": ()}
 
     def get_contributor_count(self, obj):
+        # Prefer the annotation from Project.objects.with_contributor_count()
+        count = getattr(obj, "contributor_total", None)
+        if count is not None:
+            return count
         return obj.contributors.count()
 
 
@@ -68,12 +81,13 @@ class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     event_type_display = serializers.CharField(
         source="get_event_type_display", read_only=True
     )
     is_past = serializers.BooleanField(read_only=True)
     attendance_count = serializers.SerializerMethodField()
+    banner_srcset = SrcsetField(source="banner_renditions")
 
     class Meta:
         model = Event
@@ -87,17 +101,27 @@ class EventSerializer(serializers.ModelSerializer):
             "location",
             "meeting_link",
             "banner",
+            "banner_srcset",
             "is_past",
             "attendance_count",
             "created_at",
         ]
         read_only_fields = ["created_at"]
+        field_columns = {
+            "event_type_display": ("event_type",),
+            "is_past": ("event_date",),
+            "attendance_count": (),
+        }
 
     def get_attendance_count(self, obj):
+        # Prefer the annotation from Event.objects.with_attendance_count()
+        count = getattr(obj, "present_total", None)
+        if count is not None:
+            return count
         return obj.attendances.filter(status="present").count()
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_details = UserMinimalSerializer(source="user", read_only=True)
     event_details = serializers.SerializerMethodField()
     marked_by_details = UserMinimalSerializer(source="marked_by", read_only=True)
@@ -118,6 +142,20 @@ class AttendanceSerializer(serializers.ModelSerializer):
             "status_display",
         ]
         read_only_fields = ["marked_at", "marked_by"]
+        expandable = {
+            "user": "user_details",
+            "event": "event_details",
+            "marked_by": "marked_by_details",
+        }
+        field_columns = {
+            "status_display": ("status",),
+            "event_details": (
+                "event__id",
+                "event__title",
+                "event__event_date",
+                "event__event_type",
+            ),
+        }
 
     def get_event_details(self, obj):
         return {
@@ -136,7 +174,7 @@ class AttendanceMarkSerializer(serializers.ModelSerializer):
         fields = ["user", "event", "status"]
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     assigned_to_details = UserMinimalSerializer(source="assigned_to", read_only=True)
     status_display = serializers.CharField(source="get_status_display", read_only=True)
     is_overdue = serializers.SerializerMethodField()
@@ -159,6 +197,11 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        expandable = {"assigned_to": "assigned_to_details"}
+        field_columns = {
+            "status_display": ("status",),
+            "is_overdue": ("due_date", "status"),
+        }
 
     def get_is_overdue(self, obj):
         from django.utils import timezone
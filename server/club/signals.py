@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from config.cache import invalidate_on
+from config.images import register_renditions
+from config.tags import sync_tags
+
+from . import dashboard
+from .models import Attendance, Event, Project, ProjectTech, Task
+from .points import ATTENDANCE_POINTS, award_points
+
+
+@receiver(post_save, sender=Attendance)
+def award_attendance_points(sender, instance, **kwargs):
+    """Award attendance points once, the first time a user is marked present."""
+    if instance.status == "present":
+        award_points(
+            instance.user_id,
+            ATTENDANCE_POINTS,
+            source_type="attendance",
+            source_id=instance.pk,
+            awarded_by_id=instance.marked_by_id,
+        )
+
+
+@receiver(post_save, sender=Project)
+def sync_project_tech(sender, instance, update_fields=None, **kwargs):
+    """Mirror tech_stack into ProjectTech where it is used (see config.tags)."""
+    if update_fields is None or "tech_stack" in update_fields:
+        sync_tags(instance, "tech_stack", ProjectTech, "project")
+
+
+# Dashboard cache invalidation
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_dashboard_events(sender, instance, **kwargs):
+    dashboard.invalidate_events()
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_dashboard_projects(sender, instance, **kwargs):
+    dashboard.invalidate_projects()
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def invalidate_dashboard_contributors(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        dashboard.invalidate_projects()
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_dashboard_tasks(sender, instance, **kwargs):
+    # A reassigned task also leaves the previous assignee's dashboard
+    previous = getattr(instance, "loaded_assigned_to_id", None)
+    dashboard.invalidate_users({instance.assigned_to_id, previous} - {None}, tasks=True)
+    instance.loaded_assigned_to_id = instance.assigned_to_id
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def touch_attendance_event(sender, instance, **kwargs):
+    """Attendance changes alter the event's attendance_count, and so its ETag."""
+    Event.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def touch_contributed_projects(sender, instance, action, reverse, pk_set, **kwargs):
+    """Joining or leaving changes the project's payload, and so its ETag."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Changed from the user side: instance is a user, pk_set are projects
+        projects = Project.objects.filter(pk__in=pk_set or ())
+    else:
+        projects = Project.objects.filter(pk=instance.pk)
+    projects.update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def invalidate_dashboard_attendance(sender, instance, **kwargs):
+    # Upcoming events embed their attendance counts
+    dashboard.invalidate_events()
+    dashboard.invalidate_user(instance.user_id, attendance=True)
+
+
+# Versioned API response caches (see config.cache)
+USER_SKIP_FIELDS = ("last_login", "password")
+
+invalidate_on(
+    "projects",
+    Project,
+    Project.contributors.through,
+    get_user_model(),
+    skip_fields=USER_SKIP_FIELDS,
+)
+invalidate_on("events", Event, Attendance)
+invalidate_on("tasks", Task, get_user_model(), skip_fields=USER_SKIP_FIELDS)
+
+register_renditions(
+    Event,
+    "banner",
+    sizes=[(480, 270), (960, 540), (1600, 900)],
+    namespaces=("events",),
+)
+register_renditions(
+    Project,
+    "image",
+    sizes=[(400, 300), (800, 600), (1200, 900)],
+    namespaces=("projects",),
+)
@@ -0,0 +1,394 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from config.models import CacheVersion
+from users.models import LeaderboardEntry
+from users.ranking import rebuild_leaderboard
+
+from .calendar import make_feed_token
+from .checkin import CheckInBuffer
+from .management.commands.check_projections import (
+    CASES,
+    render_with_projection,
+    render_with_serializer,
+)
+from .models import Attendance, DailyPoints, Event, PointsLedger, Project, Task
+from .points import ATTENDANCE_POINTS, award_points, award_points_bulk
+
+User = get_user_model()
+
+# The production hasher is deliberately slow
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+        Event.objects.create(
+            title="Kickoff",
+            description="First meetup",
+            event_date=timezone.now() + timedelta(days=1),
+        )
+
+    def feed_url(self, token):
+        return reverse("calendar-feed", args=[token])
+
+    def test_subscription_url_requires_login(self):
+        response = APIClient().get("/api/events/calendar/")
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_subscription_url_for_member(self):
+        client = APIClient()
+        client.force_authenticate(self.member)
+        response = client.get("/api/events/calendar/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.feed_url(make_feed_token(self.member)), response.data["url"])
+
+    def test_feed_with_valid_token(self):
+        response = self.client.get(self.feed_url(make_feed_token(self.member)))
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode()
+        self.assertIn("SUMMARY:Kickoff", body)
+
+    def test_feed_rejects_forged_token(self):
+        response = self.client.get(self.feed_url("not-a-token"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_feed_rejects_token_after_password_change(self):
+        token = make_feed_token(self.member)
+        self.member.set_password("changed")
+        self.member.save()
+        self.assertEqual(self.client.get(self.feed_url(token)).status_code, 403)
+
+    def test_feed_rejects_token_of_deactivated_member(self):
+        token = make_feed_token(self.member)
+        self.member.is_active = False
+        self.member.save()
+        self.assertEqual(self.client.get(self.feed_url(token)).status_code, 403)
+
+    def test_missing_token_is_not_a_feed(self):
+        self.assertEqual(self.client.get("/api/calendar/.ics").status_code, 404)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user(
+            "admin", "admin@example.com", "password", is_club_admin=True
+        )
+        member = User.objects.create_user(
+            "member", "member@example.com", "password", first_name="Ada"
+        )
+        User.objects.filter(pk=member.pk).update(
+            avatar="avatars/ada.png",
+            avatar_renditions={"webp": {"64": "renditions/ada.webp"}},
+        )
+        project = Project.objects.create(
+            name="Portal",
+            description="Club website",
+            status="in_progress",
+            tech_stack=["django", "react"],
+            github_repo="https://github.com/example/portal",
+            lead=admin,
+        )
+        project.contributors.set([admin, member])
+        Project.objects.filter(pk=project.pk).update(
+            image="project_images/portal.png",
+            image_renditions={
+                "webp": {"320": "renditions/a.webp", "640": "renditions/b.webp"},
+                "jpeg": {"320": "renditions/a.jpeg"},
+            },
+        )
+        Project.objects.create(name="Idea", description="", lead=None)
+
+        now = timezone.now()
+        past = Event.objects.create(
+            title="Kickoff",
+            description="First meetup",
+            event_type="workshop",
+            event_date=now - timedelta(days=7),
+            location="Online",
+            meeting_link="https://meet.example.com/kickoff",
+        )
+        Event.objects.create(
+            title="Demo day",
+            description="",
+            event_date=now + timedelta(days=7),
+            location="Hall A",
+        )
+        Attendance.objects.create(
+            user=member, event=past, marked_by=admin, status="present"
+        )
+        Attendance.objects.create(user=admin, event=past, status="excused")
+
+        Task.objects.create(
+            title="Write docs",
+            description="",
+            assigned_to=member,
+            due_date=now - timedelta(days=1),
+        )
+        Task.objects.create(
+            title="Review",
+            description="",
+            assigned_to=admin,
+            status="verified",
+            submission_link="https://example.com/pr/1",
+        )
+
+    def test_projections_match_serializers(self):
+        context = {"request": RequestFactory().get("/")}
+        for name, queryset, ordering, serializer_class, projection_class in CASES:
+            with self.subTest(name):
+                page = queryset.all().order_by(ordering, "-pk")
+                self.assertTrue(page.exists())
+                self.assertEqual(
+                    render_with_projection(projection_class, page, context),
+                    render_with_serializer(serializer_class, page, context),
+                )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user(
+            "admin", "admin@example.com", "password", is_club_admin=True
+        )
+        member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+        project = Project.objects.create(
+            name="Portal", description="", status="in_progress", lead=admin
+        )
+        project.contributors.add(member)
+        event = Event.objects.create(
+            title="Kickoff",
+            description="",
+            event_date=timezone.now() + timedelta(days=1),
+            location="Online",
+        )
+        Attendance.objects.create(user=member, event=event, marked_by=admin)
+        Task.objects.create(
+            title="Write docs", description="", assigned_to=member, status="submitted"
+        )
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("check_query_plans", stdout=out)
+        self.assertIn("No hot query scans a large table", out.getvalue())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+        cls.project = Project.objects.create(name="Portal", description="")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def test_current_etag_gets_304(self):
+        etag = self.client.get("/api/projects/")["ETag"]
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_etag_and_body(self):
+        etag = self.client.get("/api/projects/")["ETag"]
+        self.project.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["name"], "Renamed")
+
+    def test_bump_from_another_process_skips_local_cached_body(self):
+        etag = self.client.get("/api/projects/")["ETag"]
+        # A worker process changes the row and bumps the namespace; this
+        # process's cache never hears about it
+        Project.objects.filter(pk=self.project.pk).update(name="Renamed")
+        CacheVersion.objects.filter(namespace="projects").update(
+            version=F("version") + 1
+        )
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["name"], "Renamed")
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def test_attendees_are_paginated(self):
+        event = Event.objects.create(
+            title="Kickoff", description="", event_date=timezone.now()
+        )
+        Attendance.objects.create(user=self.member, event=event)
+        response = self.client.get(f"/api/events/{event.pk}/attendees/?page_size=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["user"] for row in response.data["results"]], [self.member.pk]
+        )
+        self.assertIsNone(response.data["next"])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CheckInBufferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+        cls.event = Event.objects.create(
+            title="Kickoff", description="", event_date=timezone.now()
+        )
+
+    def setUp(self):
+        self.buffer = CheckInBuffer(flush_size=100, flush_interval=30)
+        self.addCleanup(lambda: self.buffer._timer and self.buffer._timer.cancel())
+
+    def test_failed_flush_is_retried_with_backoff(self):
+        self.buffer.add(self.event.pk, self.member.pk)
+        with mock.patch("club.checkin.check_in_attendance", side_effect=RuntimeError):
+            self.buffer.flush()
+            self.assertEqual(self.buffer._timer.interval, 30)
+            self.buffer._timer.cancel()
+            self.buffer._timer = None
+            self.buffer.flush()
+            self.assertEqual(self.buffer._timer.interval, 60)
+        self.assertEqual(self.buffer._pending, {self.event.pk: {self.member.pk}})
+
+        self.buffer.flush()
+        self.assertTrue(
+            Attendance.objects.filter(user=self.member, event=self.event).exists()
+        )
+        self.assertEqual(self.buffer._pending, {})
+        self.assertEqual(self.buffer._failures, 0)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class PointsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ada, cls.bob, cls.cy = (
+            User.objects.create_user(
+                name, f"{name}@example.com", "password", is_member=True
+            )
+            for name in ("ada", "bob", "cy")
+        )
+
+    def points(self, user):
+        user.refresh_from_db(fields=["points"])
+        return user.points
+
+    def ranks(self):
+        return dict(LeaderboardEntry.objects.values_list("user__username", "rank"))
+
+    def test_duplicate_source_is_awarded_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNotNone(award_points(self.ada.pk, 10, "task", 1))
+            self.assertIsNone(award_points(self.ada.pk, 10, "task", 1))
+            awarded = award_points_bulk(
+                [(self.ada.pk, 1), (self.bob.pk, 2), (self.bob.pk, 2)], 10, "task"
+            )
+        self.assertEqual(awarded, 1)
+        self.assertEqual(self.points(self.ada), 10)
+        self.assertEqual(self.points(self.bob), 10)
+        self.assertEqual(PointsLedger.objects.count(), 2)
+        self.assertEqual(DailyPoints.objects.get(user=self.ada).points, 10)
+
+    def test_same_source_id_of_another_type_is_awarded(self):
+        award_points(self.ada.pk, 10, "task", 1)
+        self.assertIsNotNone(award_points(self.ada.pk, 5, "attendance", 1))
+        self.assertEqual(self.points(self.ada), 15)
+
+    def test_ranks_follow_awards(self):
+        rebuild_leaderboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(self.bob.pk, 10, "task", 1)
+            award_points(self.cy.pk, 5, "task", 2)
+        self.assertEqual(self.ranks(), {"bob": 1, "cy": 2, "ada": 3})
+
+        # Ties share a rank and the next one is skipped
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points_bulk([(self.ada.pk, 3)], 10, "task")
+        self.assertEqual(self.ranks(), {"ada": 1, "bob": 1, "cy": 3})
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class BulkMarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            "admin", "admin@example.com", "password", is_staff=True
+        )
+        cls.ada, cls.bob = (
+            User.objects.create_user(name, f"{name}@example.com", "password")
+            for name in ("ada", "bob")
+        )
+        cls.event = Event.objects.create(
+            title="Kickoff", description="", event_date=timezone.now()
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, text, status="present"):
+        upload = SimpleUploadedFile("users.csv", text.encode(), "text/csv")
+        return self.client.post(
+            "/api/attendance/bulk_mark/",
+            {"event": self.event.pk, "status": status, "file": upload},
+            format="multipart",
+        )
+
+    def test_csv_marks_known_users(self):
+        response = self.upload("\ufeffUsername\nada\nghost\nbob\n\n")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], [self.ada.pk, self.bob.pk])
+        self.assertEqual(response.data["invalid"], ["ghost"])
+        self.assertEqual(
+            Attendance.objects.filter(event=self.event, status="present").count(), 2
+        )
+        self.ada.refresh_from_db(fields=["points"])
+        self.assertEqual(self.ada.points, ATTENDANCE_POINTS)
+
+    def test_csv_upload_again_updates_without_awarding_twice(self):
+        self.upload("email\nada@example.com\n")
+        response = self.upload("email\nada@example.com\n")
+        self.assertEqual(response.data["updated"], [self.ada.pk])
+        self.ada.refresh_from_db(fields=["points"])
+        self.assertEqual(self.ada.points, ATTENDANCE_POINTS)
+
+    def test_csv_without_user_column_is_rejected(self):
+        response = self.upload("name\nAda\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("user_id", response.data["detail"])
+        self.assertFalse(Attendance.objects.exists())
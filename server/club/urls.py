@@ -6,6 +6,7 @@ from .views import (
     EventViewSet,
     AttendanceViewSet,
     TaskViewSet,
+    ics_feed,
 )
 
 router = DefaultRouter()
@@ -16,5 +17,6 @@ router.register(r"tasks", TaskViewSet, basename="task")
 
 urlpatterns = [
     path("dashboard/", DashboardViewSet.as_view({"get": "list"}), name="api-dashboard"),
+    path("calendar/<str:token>.ics", ics_feed, name="calendar-feed"),
     path("", include(router.urls)),
 ]
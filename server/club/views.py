@@ -1,9 +1,36 @@
-from rest_framework import viewsets, permissions, status
+import datetime
+
+from rest_framework import exceptions, viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+from django.db import transaction
 from django.db.models import Q
-from .models import Task, Event, Project, Attendance
+from config.cache import bump_version, cached_response
+from config.conditional import ConditionalGetMixin, conditional_get, namespace_etag
+from config.facets import FacetsMixin
+from config.projections import ProjectionListMixin
+from config.sparse import SparseQuerysetMixin
+from config.tags import count_tags, filter_by_tags
+
+from . import checkin, dashboard
+from .calendar import feed_events, make_feed_token, read_feed_token, stream_feed
+from .attendance import CSVError, bulk_mark_attendance, read_user_csv
+from .models import Task, Event, Project, ProjectTech, Attendance
+from .points import award_points
+from .projections import (
+    AttendanceProjection,
+    EventProjection,
+    ProjectProjection,
+    TaskProjection,
+)
 from .serializers import (
     TaskSerializer,
     TaskCreateUpdateSerializer,
@@ -27,6 +54,42 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return request.user and (request.user.is_club_admin or request.user.is_staff)
 
 
+class IsClubAdmin(permissions.BasePermission):
+    """
+    Club admins and staff only.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_club_admin or request.user.is_staff
+        )
+
+
+def parse_date_param(request, name):
+    """
+    An aware datetime from an ISO date or datetime query parameter, or None.
+    Dates mean midnight and naive values the current timezone.
+    """
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is not None:
+                parsed = datetime.datetime.combine(date, datetime.time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise exceptions.ValidationError(
+            {name: "Use an ISO 8601 date or datetime, e.g. 2025-03-01"}
+        )
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
 class DashboardViewSet(viewsets.ViewSet):
     """
     Dashboard endpoint providing overview of user's tasks and upcoming events.
@@ -37,28 +100,8 @@ class DashboardViewSet(viewsets.ViewSet):
     def list(self, request):
         user = request.user
 
-        # Active Tasks assigned to user
-        active_tasks = Task.objects.filter(
-            assigned_to=user, status__in=["pending", "in_progress"]
-        ).order_by("due_date")
-        task_serializer = TaskSerializer(active_tasks, many=True)
-
-        # Upcoming Events (next 5)
-        upcoming_events = Event.objects.filter(event_date__gte=timezone.now()).order_by(
-            "event_date"
-        )[:5]
-        event_serializer = EventSerializer(upcoming_events, many=True)
-
-        # User's recent projects
-        # Show recent club projects (global) instead of just user's
-        recent_projects = Project.objects.all().order_by("-created_at")[:5]
-        project_serializer = ProjectSerializer(recent_projects, many=True)
-
-        # User's attendance count
-        attendance_count = Attendance.objects.filter(
-            user=user, status="present"
-        ).count()
-
+        # Shared fragments are cached once, per-user ones by user id;
+        # see club.dashboard for how they are invalidated
         return Response(
             {
                 "user": {
@@ -74,24 +117,37 @@ class DashboardViewSet(viewsets.ViewSet):
                     else None,
                     "is_admin": user.is_club_admin or user.is_staff,
                 },
-                "active_tasks": task_serializer.data,
-                "upcoming_events": event_serializer.data,
-                "recent_projects": project_serializer.data,
-                "attendance_count": attendance_count,
+                "active_tasks": dashboard.get_active_tasks(user),
+                "upcoming_events": dashboard.get_upcoming_events(),
+                "recent_projects": dashboard.get_recent_projects(),
+                "attendance_count": dashboard.get_attendance_count(user),
             }
         )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(
+    FacetsMixin,
+    ConditionalGetMixin,
+    ProjectionListMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for managing projects.
     List, Create, Retrieve, Update, Delete projects.
     """
 
     queryset = (
-        Project.objects.all().select_related("lead").prefetch_related("contributors")
+        Project.objects.with_contributor_count()
+        .select_related("lead")
+        .prefetch_related("contributors")
     )
     permission_classes = [IsAdminOrReadOnly]
+    list_projection = ProjectProjection
+    cursor_ordering = ("-created_at", "-pk")
+    etag_namespaces = ("projects",)
+    facet_fields = ("status",)
+    facets_namespace = "projects"
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -99,8 +155,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return ProjectSerializer
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        return self.apply_query_filters(super().get_queryset())
+
+    def get_facets_queryset(self):
+        # Facets only need the filtered rows, not the annotations
+        return self.apply_query_filters(Project.objects.all())
+
+    def facets_vary_on_user(self, request):
+        return "my_projects" in request.query_params
 
+    def get_extra_facets(self, queryset):
+        return {"tech": count_tags(queryset, "tech_stack", ProjectTech, "project")}
+
+    def apply_query_filters(self, queryset):
         # Filter by status
         status = self.request.query_params.get("status", None)
         if status:
@@ -109,7 +176,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
         # Filter by tech stack
         tech = self.request.query_params.get("tech", None)
         if tech:
-            queryset = queryset.filter(tech_stack__contains=[tech])
+            queryset = filter_by_tags(
+                queryset, "tech_stack", ProjectTech, "project", [tech]
+            )
 
         # Filter by user (their projects)
         my_projects = self.request.query_params.get("my_projects", None)
@@ -120,6 +189,18 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         return queryset.order_by("-created_at")
 
+    @conditional_get
+    @cached_response(
+        "projects", vary_on_user=lambda request: "my_projects" in request.query_params
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    @cached_response("projects")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(
         detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated]
     )
@@ -159,18 +240,43 @@ class ProjectViewSet(viewsets.ModelViewSet):
         )
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(
+    ConditionalGetMixin,
+    ProjectionListMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for managing events.
     """
 
-    queryset = Event.objects.all()
+    queryset = Event.objects.with_attendance_count()
     serializer_class = EventSerializer
+    list_projection = EventProjection
     permission_classes = [IsAdminOrReadOnly]
+    etag_namespaces = ("events",)
+
+    @property
+    def cursor_ordering(self):
+        if self.action == "attendees":
+            return ("-marked_at", "-pk")
+        return ("-event_date", "-pk")
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        return self.apply_query_filters(super().get_queryset())
+
+    def get_etag_parts(self, request):
+        if "time" not in request.query_params:
+            return ()
+        # Upcoming and past lists change when the next event starts
+        return (
+            Event.objects.filter(event_date__gte=timezone.now())
+            .order_by("event_date")
+            .values_list("event_date", flat=True)
+            .first(),
+        )
 
+    def apply_query_filters(self, queryset):
         # Filter by event type
         event_type = self.request.query_params.get("type", None)
         if event_type:
@@ -183,25 +289,152 @@ class EventViewSet(viewsets.ModelViewSet):
         elif time_filter == "past":
             queryset = queryset.filter(event_date__lt=timezone.now())
 
+        # Filter by date range, e.g. a calendar month:
+        # ?start=2025-03-01&end=2025-04-01 (start inclusive, end exclusive)
+        start = parse_date_param(self.request, "start")
+        if start:
+            queryset = queryset.filter(event_date__gte=start)
+        end = parse_date_param(self.request, "end")
+        if end:
+            queryset = queryset.filter(event_date__lt=end)
+
         return queryset.order_by("-event_date")
 
+    @conditional_get
+    @cached_response("events")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    @cached_response("events")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="calendar",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def calendar_feed(self, request):
+        """Private .ics subscription URL for the current user"""
+        url = request.build_absolute_uri(
+            reverse("calendar-feed", args=[make_feed_token(request.user)])
+        )
+        event_type = request.query_params.get("type")
+        if event_type:
+            url += f"?type={event_type}"
+        return Response(
+            {"url": url, "webcal_url": "webcal://" + url.split("://", 1)[1]}
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[permissions.IsAuthenticated, IsClubAdmin],
+    )
+    def checkin_code(self, request, pk=None):
+        """Issue a short-lived self check-in code for an event - admin only"""
+        event = self.get_object()
+        return Response(
+            {
+                "event": event.id,
+                "code": checkin.make_checkin_code(event),
+                "expires_in": settings.CHECKIN_CODE_MAX_AGE,
+            }
+        )
+
+    @action(
+        detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated]
+    )
+    def checkin(self, request, pk=None):
+        """
+        Check the current user in with a code from `checkin_code`.
+        The code is verified without a database lookup and the attendance row
+        is written in a later batch, so this returns 202.
+        """
+        try:
+            event_id = checkin.read_checkin_code(request.data.get("code", ""))
+        except signing.SignatureExpired:
+            return Response(
+                {"detail": "Check-in code has expired"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except (signing.BadSignature, ValueError):
+            return Response(
+                {"detail": "Invalid check-in code"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if str(event_id) != str(pk):
+            return Response(
+                {"detail": "Check-in code is for a different event"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        checkin.buffer.add(event_id, request.user.pk)
+        return Response({"detail": "Checked in"}, status=status.HTTP_202_ACCEPTED)
+
     @action(detail=True, methods=["get"])
     def attendees(self, request, pk=None):
         """Get list of attendees for an event"""
         event = self.get_object()
-        attendances = Attendance.objects.filter(event=event).select_related("user")
-        serializer = AttendanceSerializer(attendances, many=True)
-        return Response(serializer.data)
+        projection = AttendanceProjection(self.get_serializer_context())
+        attendances = projection.values(Attendance.objects.filter(event=event))
+        page = self.paginate_queryset(attendances)
+        if page is not None:
+            return self.get_paginated_response(projection.serialize(page))
+        return Response(projection.serialize(list(attendances)))
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+@require_GET
+def ics_feed(request, token):
+    """
+    Streamed iCalendar feed of club events (see club.calendar).
+    Authenticated by the signed token in the URL, not the session: a
+    forged, revoked or deactivated member's token gets 403.
+    """
+    try:
+        read_feed_token(token)
+    except signing.BadSignature:
+        return HttpResponseForbidden("Invalid or revoked calendar feed token")
+
+    event_type = request.GET.get("type")
+    labels = dict(Event.EVENT_TYPE_CHOICES)
+    if event_type and event_type not in labels:
+        return HttpResponse(f"type must be one of: {', '.join(labels)}", status=400)
+
+    events = feed_events(event_type)
+    # The feed's window moves by the day
+    etag = namespace_etag(("events",), request.get_full_path(), timezone.localdate())
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponse(status=304)
+    else:
+        name = "NST SDC Events"
+        if event_type:
+            name += f": {labels[event_type]}"
+        response = StreamingHttpResponse(
+            stream_feed(events, name, request.get_host()),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = 'inline; filename="events.ics"'
+    response["ETag"] = etag
+    response["Cache-Control"] = f"private, max-age={settings.CALENDAR_FEED_MAX_AGE}"
+    return response
+
+
+class AttendanceViewSet(
+    ProjectionListMixin, SparseQuerysetMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing attendance records.
     """
 
     queryset = Attendance.objects.all().select_related("user", "event", "marked_by")
     serializer_class = AttendanceSerializer
+    list_projection = AttendanceProjection
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-marked_at", "-pk")
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -240,44 +473,72 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         detail=False, methods=["post"], permission_classes=[permissions.IsAdminUser]
     )
     def bulk_mark(self, request):
-        """Bulk mark attendance for multiple users"""
+        """
+        Bulk mark attendance for multiple users in one upsert.
+        Accepts a JSON list of `users` ids or a CSV `file` upload.
+        """
         event_id = request.data.get("event")
-        user_ids = request.data.get("users", [])
         attendance_status = request.data.get("status", "present")
-
-        if not event_id or not user_ids:
+        unknown = []
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                user_ids, unknown = read_user_csv(upload)
+            except CSVError as exc:
+                return Response(
+                    {"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            user_ids = request.data.get("users", [])
+
+        if not event_id or not (user_ids or unknown):
             return Response(
                 {"detail": "event and users are required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        valid_statuses = dict(Attendance._meta.get_field("status").choices)
+        if attendance_status not in valid_statuses:
+            return Response(
+                {"detail": f"status must be one of: {', '.join(valid_statuses)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         try:
             event = Event.objects.get(id=event_id)
-        except Event.DoesNotExist:
+        except (Event.DoesNotExist, ValueError):
             return Response(
                 {"detail": "Event not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        created_count = 0
-        for user_id in user_ids:
-            attendance, created = Attendance.objects.get_or_create(
-                user_id=user_id,
-                event=event,
-                defaults={"marked_by": request.user, "status": attendance_status},
-            )
-            if created:
-                created_count += 1
+        result = bulk_mark_attendance(
+            event, user_ids, attendance_status, marked_by=request.user
+        )
+        result["invalid"] += unknown
 
-        return Response({"detail": f"Marked attendance for {created_count} users"})
+        marked = len(result["created"]) + len(result["updated"])
+        return Response({"detail": f"Marked attendance for {marked} users", **result})
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(
+    FacetsMixin,
+    ConditionalGetMixin,
+    ProjectionListMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for managing tasks.
     """
 
     queryset = Task.objects.all().select_related("assigned_to")
+    list_projection = TaskProjection
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "-pk")
+    etag_namespaces = ("tasks",)
+    facet_fields = ("status",)
+    facets_namespace = "tasks"
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -304,6 +565,14 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return queryset.order_by("-created_at")
 
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Only admins can create tasks"""
         if not (self.request.user.is_club_admin or self.request.user.is_staff):
@@ -340,19 +609,28 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Verify a submitted task and award points"""
         task = self.get_object()
 
-        if task.status != "submitted":
-            return Response(
-                {"detail": "Task must be submitted before verification"},
-                status=status.HTTP_400_BAD_REQUEST,
+        with transaction.atomic():
+            # Conditional UPDATE makes the submitted -> verified transition
+            # atomic, so a double click or a second admin cannot verify twice
+            verified = Task.objects.filter(pk=task.pk, status="submitted").update(
+                status="verified", updated_at=timezone.now()
             )
+            if not verified:
+                return Response(
+                    {"detail": "Task must be submitted before verification"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            award_points(
+                task.assigned_to_id,
+                task.points,
+                source_type="task",
+                source_id=task.pk,
+                awarded_by_id=request.user.pk,
+            )
+            # update() skips post_save, which would bump the namespace
+            transaction.on_commit(lambda: bump_version("tasks"))
 
-        task.status = "verified"
-        task.save()
-
-        # Award points to user
-        user = task.assigned_to
-        user.points += task.points
-        user.save()
-
+        task.refresh_from_db()
         serializer = self.get_serializer(task)
         return Response({"task": serializer.data, "points_awarded": task.points})
@@ -0,0 +1,239 @@
+"""
+Project-wide caching helpers built on the configured Django cache.
+
+- Namespaced version counters: every key in a namespace embeds the current
+  version, and model writes bump it once they commit (see `invalidate_on`),
+  so a whole namespace is invalidated with a single UPDATE instead of key
+  scans. The counters live in the database (config.models.CacheVersion),
+  not the cache, so a bump from `runworker` or another web process is seen
+  by every process even when each has its own LocMem cache. Conditional
+  GETs build their ETags from the same counters (see config.conditional).
+- Single-flight recomputation: when a key is missing or due for refresh, only
+  the worker that wins a short `cache.add` lock recomputes it. Others keep
+  serving the previous value, or wait briefly for the winner's result: about
+  as long as the key took to compute last time, and no longer than the
+  winner holds the lock.
+- Early probabilistic refresh (XFetch): a hot key is refreshed shortly before
+  it expires, with a probability that grows as expiry approaches and with
+  how long the value took to compute, so it never expires under load.
+- Hit/miss counters per namespace, stored in the shared cache so they add up
+  across workers.
+"""
+
+import functools
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.response import Response
+
+from .models import CacheVersion
+
+# Namespaces seen by this process, for reporting stats
+NAMESPACES = set()
+
+# How long a recompute lock is held before another worker may take over
+LOCK_TIMEOUT = 30
+
+# Waiters poll for the lock holder's result at this interval (seconds)
+LOCK_POLL_INTERVAL = 0.05
+
+# Waiters give up on the lock holder after this many times the key's last
+# compute time, but never sooner than LOCK_MIN_WAIT seconds
+LOCK_WAIT_FACTOR = 2
+LOCK_MIN_WAIT = 0.5
+
+# How long a key's last compute time is remembered, across invalidations
+COMPUTE_TIME_TIMEOUT = 24 * 60 * 60
+
+
+def get_version(namespace):
+    versions = CacheVersion.objects.filter(namespace=namespace)
+    version = versions.values_list("version", flat=True).first()
+    if version is None:
+        # Seed with a timestamp so a recreated counter can't come back at a
+        # value that matches entries cached under an older version
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(namespace=namespace, version=time.time_ns())],
+            ignore_conflicts=True,
+        )
+        version = versions.values_list("version", flat=True).first()
+    return version
+
+
+def _increment(namespace):
+    versions = CacheVersion.objects.filter(namespace=namespace)
+    if not versions.update(version=F("version") + 1):
+        get_version(namespace)
+
+
+def bump_version(namespace):
+    """
+    Invalidate every key in `namespace` once the current transaction
+    commits: a rolled-back write invalidates nothing, and writers don't hold
+    the counter's row lock for the rest of their transaction.
+    """
+    transaction.on_commit(functools.partial(_increment, namespace))
+
+
+def make_key(namespace, key):
+    NAMESPACES.add(namespace)
+    return f"{namespace}:v{get_version(namespace)}:{key}"
+
+
+def _count(namespace, outcome):
+    key = f"cachestats:{namespace}:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_stats():
+    """Hit/miss counters for every namespace used by this process."""
+    stats = {}
+    for namespace in sorted(NAMESPACES):
+        hits = cache.get(f"cachestats:{namespace}:hit", 0)
+        misses = cache.get(f"cachestats:{namespace}:miss", 0)
+        total = hits + misses
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "early_refreshes": cache.get(f"cachestats:{namespace}:refresh", 0),
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def get_or_compute(namespace, key, compute, timeout, beta=1.0):
+    """
+    Return the cached value for `key` in `namespace`, computing it with
+    `compute()` on a miss. At most one worker computes a given key at a time.
+    """
+    full_key = make_key(namespace, key)
+    lock_key = f"{full_key}:lock"
+    # Unversioned, so it survives the namespace being invalidated
+    compute_time_key = f"cachecost:{namespace}:{key}"
+
+    entry = cache.get(full_key)
+    locked = False
+    if entry is not None:
+        value, compute_time, expires_at = entry
+        # XFetch: -log(U) is exponentially distributed, so the chance of an
+        # early refresh rises smoothly as expires_at approaches
+        early = compute_time * beta * -math.log(1.0 - random.random())
+        if time.time() + early < expires_at:
+            _count(namespace, "hit")
+            return value
+        if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            # Another worker is already refreshing; serve the current value
+            _count(namespace, "hit")
+            return value
+        locked = True
+        _count(namespace, "refresh")
+    else:
+        _count(namespace, "miss")
+        locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        if not locked:
+            expected = cache.get(compute_time_key, 0)
+            wait = min(LOCK_TIMEOUT, max(LOCK_MIN_WAIT, LOCK_WAIT_FACTOR * expected))
+            deadline = time.monotonic() + wait
+            while True:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(full_key)
+                if entry is not None:
+                    return entry[0]
+                # Lock released without a value (the holder failed or the
+                # value wasn't cacheable), or the holder is overdue: compute
+                # it here rather than keep waiting
+                if cache.get(lock_key) is None or time.monotonic() >= deadline:
+                    break
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        compute_time = time.monotonic() - started
+        cache.set(full_key, (value, compute_time, time.time() + timeout), timeout)
+        cache.set(compute_time_key, compute_time, COMPUTE_TIME_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def cached_response(namespace, timeout=None, vary_on_user=False):
+    """
+    Cache-aside decorator for ViewSet/APIView handlers such as `list` and
+    `retrieve`. Only 200 responses are cached, keyed by the full request URL.
+    Permission checks run before the handler, so they still apply on hits.
+
+    `vary_on_user` may be a bool or a callable taking the request, for views
+    that return user-specific data for some query parameters only.
+    `timeout` defaults to settings.API_CACHE_TIMEOUT.
+    """
+    if timeout is None:
+        timeout = settings.API_CACHE_TIMEOUT
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            per_user = vary_on_user(request) if callable(vary_on_user) else vary_on_user
+            key = request.build_absolute_uri()
+            if per_user:
+                key = f"user:{request.user.pk}:{key}"
+
+            def compute():
+                response = handler(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise _Uncacheable(response)
+                return response.data
+
+            try:
+                data = get_or_compute(namespace, key, compute, timeout)
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+            return Response(data)
+
+        return wrapper
+
+    return decorator
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def invalidate_on(namespace, *senders, skip_fields=()):
+    """
+    Bump `namespace` whenever any of `senders` is saved or deleted (or, for
+    m2m through models, changed). Saves whose `update_fields` only touch
+    `skip_fields` (e.g. last_login) leave the namespace alone.
+    """
+    NAMESPACES.add(namespace)
+    skip_fields = set(skip_fields)
+
+    def on_save(sender, update_fields=None, **kwargs):
+        if update_fields is not None and set(update_fields) <= skip_fields:
+            return
+        bump_version(namespace)
+
+    def on_delete(sender, **kwargs):
+        bump_version(namespace)
+
+    def on_m2m(sender, action, **kwargs):
+        if action in ("post_add", "post_remove", "post_clear"):
+            bump_version(namespace)
+
+    for sender in senders:
+        if sender._meta.auto_created:
+            m2m_changed.connect(on_m2m, sender=sender, weak=False)
+        else:
+            post_save.connect(on_save, sender=sender, weak=False)
+            post_delete.connect(on_delete, sender=sender, weak=False)
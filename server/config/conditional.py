@@ -0,0 +1,81 @@
+"""
+Conditional GET support (ETag / If-None-Match) for API views.
+
+The ETag is built from the versions of the config.cache namespaces the
+response depends on (one primary-key lookup each, bumped by every write
+that changes them), the request URL and the user, so a matching
+`If-None-Match` is answered with 304 before anything is fetched or
+serialized. Cached response bodies are keyed on the same versions, so a
+body never outlives the ETag it was served with. Responses carry `Cache-Control: private, no-cache` so browsers
+keep the body and revalidate it on every navigation.
+"""
+
+import functools
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_version
+
+
+def make_etag(*parts):
+    """Strong ETag from the string forms of `parts`."""
+    raw = "|".join(str(part) for part in parts)
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def namespace_etag(namespaces, *extra):
+    """Strong ETag from the current versions of cache `namespaces`."""
+    return make_etag(*(get_version(namespace) for namespace in namespaces), *extra)
+
+
+def conditional_get(handler):
+    """
+    Answer GET handlers with 304 when the client's ETag is current.
+    The view must implement `get_etag(request)`. Apply it above any
+    response cache so revalidation never touches the cache either.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        etag = view.get_etag(request)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (
+            if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+        ):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    return wrapper
+
+
+class ConditionalGetMixin:
+    """
+    ETags for ModelViewSet `list` and `retrieve`; decorate those handlers
+    with `conditional_get` (above any `cached_response`) to use them.
+
+    `etag_namespaces` lists the config.cache namespaces bumped whenever a
+    serialized row would change. Override `get_etag_parts` to add anything
+    else the response depends on, such as the time for time-based filters.
+    """
+
+    etag_namespaces = ()
+
+    def get_etag_parts(self, request):
+        return ()
+
+    def get_etag(self, request):
+        return namespace_etag(
+            self.etag_namespaces,
+            request.get_full_path(),
+            request.user.pk,
+            *self.get_etag_parts(request),
+        )
@@ -0,0 +1,77 @@
+"""
+Facet counts for list endpoints.
+
+`FacetsMixin` adds a `facets/` action to a ModelViewSet. It applies the same
+filters as `list` and returns the total plus, per dimension, the count of
+rows for each value, computed with one grouped aggregate query per
+dimension. Results are cached in the view's cache namespace, so writes that
+bump the namespace invalidate them.
+"""
+
+from django.conf import settings
+from django.db.models import Count
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .cache import get_or_compute
+
+
+def count_by(queryset, field):
+    """[(value, count)] for `field` over `queryset`, most common first."""
+    return list(
+        queryset.order_by()
+        .values_list(field)
+        .annotate(count=Count("pk"))
+        .order_by("-count", field)
+    )
+
+
+class FacetsMixin:
+    """
+    `facet_fields` lists the model fields to group by. Override
+    `get_extra_facets(queryset)` for dimensions that aren't plain columns,
+    and `facets_vary_on_user(request)` when the filtered rows don't depend
+    on who is asking.
+    """
+
+    facet_fields = ()
+    facets_namespace = None
+
+    def facets_vary_on_user(self, request):
+        return True
+
+    def get_facets_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_extra_facets(self, queryset):
+        return {}
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        key = f"facets:{request.build_absolute_uri()}"
+        if self.facets_vary_on_user(request):
+            key = f"user:{request.user.pk}:{key}"
+        data = get_or_compute(
+            self.facets_namespace,
+            key,
+            lambda: self.compute_facets(request),
+            settings.API_CACHE_TIMEOUT,
+        )
+        return Response(data)
+
+    def compute_facets(self, request):
+        queryset = self.get_facets_queryset()
+        if queryset.query.distinct:
+            # Group the distinct rows, not the joins that needed DISTINCT
+            queryset = queryset.model._default_manager.filter(
+                pk__in=queryset.values("pk")
+            )
+        facets = {field: count_by(queryset, field) for field in self.facet_fields}
+        facets.update(self.get_extra_facets(queryset))
+        return {
+            "total": queryset.count(),
+            "facets": {
+                name: [{"value": value, "count": count} for value, count in rows]
+                for name, rows in facets.items()
+            },
+        }
@@ -0,0 +1,214 @@
+"""
+Derived image renditions for uploaded images.
+
+`register_renditions(model, field, sizes)` makes every save that changes
+`model.<field>` queue a background job (see jobs.queue) that renders the
+image at each (width, height) in `sizes`. Renditions are center-cropped,
+re-encoded as WebP and JPEG without the original's EXIF data (orientation
+is applied first), and stored under content-hashed names in `renditions/`,
+so they can be cached forever. The storage names are kept in the model's
+`<field>_renditions` JSON column, and `SrcsetField` serializes them as
+srcset strings per format. `manage.py build_image_renditions` backfills
+existing media.
+
+The original upload is served too, so before a new upload is stored it is
+re-encoded in its own format without EXIF (including GPS), XMP or other
+metadata. Images over Pillow's MAX_IMAGE_PIXELS are treated as invalid
+rather than decoded.
+"""
+
+import hashlib
+import io
+import logging
+import warnings
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+from jobs.queue import job
+
+from .cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = "renditions"
+
+# Extension -> (Pillow format, save options)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Save options for re-encoding an original without its metadata
+ORIGINAL_OPTIONS = {"JPEG": {"quality": 95}, "WEBP": {"quality": 95}}
+
+# What opening or decoding an unusable upload raises
+IMAGE_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+# (model, field, sizes, cache namespaces) for every registered image field
+REGISTRY = []
+
+
+def open_image(source):
+    """
+    Image.open, but an image over MAX_IMAGE_PIXELS raises
+    DecompressionBombError instead of only warning.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        try:
+            return Image.open(source)
+        except Image.DecompressionBombWarning as warning:
+            raise Image.DecompressionBombError(str(warning)) from None
+
+
+def strip_metadata(field_file):
+    """
+    Replace an uncommitted upload's content with the same image re-encoded
+    without metadata; orientation is applied to the pixels first.
+    """
+    with open_image(field_file) as image:
+        image_format = image.format
+        animated = getattr(image, "is_animated", False)
+        options = dict(ORIGINAL_OPTIONS.get(image_format, {}))
+        if animated:
+            options["save_all"] = True
+        else:
+            image = ImageOps.exif_transpose(image)
+        if image.info.get("icc_profile"):
+            # Colour profile, not metadata; keeps colours as uploaded
+            options["icc_profile"] = image.info["icc_profile"]
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+    field_file.file = ContentFile(buffer.getvalue(), name=field_file.name)
+
+
+def render(field_file, sizes):
+    """Render `field_file` at `sizes`; returns the map stored on the model."""
+    with field_file.open("rb") as source, open_image(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            # JPEG has no alpha; flatten transparent areas onto white
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
+
+        renditions = {"source": field_file.name}
+        for width, height in sizes:
+            thumb = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+            for ext, (image_format, options) in FORMATS.items():
+                buffer = io.BytesIO()
+                thumb.save(buffer, image_format, **options)
+                content = buffer.getvalue()
+                digest = hashlib.sha256(content).hexdigest()[:24]
+                name = f"{RENDITION_DIR}/{digest}.{ext}"
+                if not default_storage.exists(name):
+                    name = default_storage.save(name, ContentFile(content))
+                renditions.setdefault(ext, {})[str(width)] = name
+    return renditions
+
+
+def update_renditions(instance, field, sizes, namespaces=()):
+    """Render `instance.<field>` and store the result without sending signals."""
+    field_file = getattr(instance, field)
+    renditions = {}
+    if field_file:
+        try:
+            renditions = render(field_file, sizes)
+        except IMAGE_ERRORS:
+            logger.exception("Could not render %s for %r", field, instance)
+            return False
+
+    # updated_at moves so ETags and cached responses pick up the new URLs
+    type(instance).objects.filter(pk=instance.pk).update(
+        **{f"{field}_renditions": renditions, "updated_at": timezone.now()}
+    )
+    for namespace in namespaces:
+        bump_version(namespace)
+    return True
+
+
+def needs_renditions(instance, field):
+    field_file = getattr(instance, field)
+    stored = getattr(instance, f"{field}_renditions") or {}
+    return (field_file.name or None) != stored.get("source")
+
+
+@job(unique=True)
+def render_renditions(model_label, pk, field):
+    """Job: bring one registered image field's renditions up to date."""
+    for model, registered_field, sizes, namespaces in REGISTRY:
+        if model._meta.label == model_label and registered_field == field:
+            # Re-read so the latest upload wins if several saves were queued
+            instance = model.objects.filter(pk=pk).first()
+            if (
+                instance is not None
+                and needs_renditions(instance, field)
+                and not update_renditions(instance, field, sizes, namespaces)
+            ):
+                raise RuntimeError(f"Could not render {model_label}.{field}")
+            return
+
+
+def register_renditions(model, field, sizes, namespaces=()):
+    """
+    Keep `model.<field>_renditions` current. `namespaces` are the
+    config.cache namespaces whose responses include the image.
+    """
+    REGISTRY.append((model, field, sizes, namespaces))
+
+    def before_save(sender, instance, **kwargs):
+        field_file = getattr(instance, field)
+        if not field_file or field_file._committed:
+            return
+        try:
+            strip_metadata(field_file)
+        except IMAGE_ERRORS:
+            # Upload validation rejects these; the render job will log it
+            logger.warning("Could not strip metadata from %s", field_file.name)
+
+    def on_save(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field not in update_fields:
+            return
+        if needs_renditions(instance, field):
+            render_renditions.delay(model._meta.label, instance.pk, field)
+
+    pre_save.connect(before_save, sender=model, weak=False)
+    post_save.connect(on_save, sender=model, weak=False)
+
+
+def srcset(renditions, request=None):
+    """Map of format -> srcset string for a `<field>_renditions` value."""
+    result = {}
+    for ext in FORMATS:
+        widths = (renditions or {}).get(ext) or {}
+        entries = []
+        for width, name in sorted(widths.items(), key=lambda item: int(item[0])):
+            url = default_storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            entries.append(f"{url} {width}w")
+        if entries:
+            result[ext] = ", ".join(entries)
+    return result
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only map of format -> srcset string, e.g.
+    {"webp": "/media/renditions/ab.webp 64w, /media/renditions/cd.webp 128w"}.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, renditions):
+        return srcset(renditions, self.context.get("request"))
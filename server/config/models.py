@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class CacheVersion(models.Model):
+    """
+    Version counter of a config.cache namespace. Kept in the database so a
+    bump from any process (a web worker or `runworker`) reaches them all,
+    whatever the cache backend.
+    """
+
+    namespace = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.namespace} v{self.version}"
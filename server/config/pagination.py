@@ -0,0 +1,29 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination shared by every list endpoint.
+
+    Views declare the columns they are ordered by through a `cursor_ordering`
+    attribute (e.g. ("-created_at", "-pk")). The cursor only records the
+    first column: rows tied on it are stepped through by offset, and DRF
+    gives up past `offset_cutoff` (1000) ties. The later columns only fix
+    the order within a tie, so the first column must be unique or close to
+    it, as timestamps are; order by a unique key where it isn't (see
+    users.search). Pages are fetched
+    with a `WHERE col < last_seen ORDER BY col LIMIT n` query, so page 100 costs the
+    same as page 1 and the cursors stay opaque and stable under inserts.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-pk")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
@@ -0,0 +1,75 @@
+"""
+Read-only list projections: a fast path for serializing list endpoints.
+
+A `Projection` produces the same JSON as a view's serializer, but from
+`.values()` rows instead of model instances. Only the columns the output
+needs are fetched, no per-row field machinery runs, and choice labels come
+from dicts built once per class. `ProjectionListMixin` makes a viewset's
+`list` action use its `list_projection`; every other action keeps using
+the serializer, as does a `list` with `?fields=`/`?expand=` (see
+config.sparse).
+
+Keep a projection's output identical to its serializer's; club.tests
+compares the two, and `manage.py check_projections` compares their speed.
+"""
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .sparse import sparse_params
+
+# DRF's own conversion, so timestamps match the serializer output exactly
+to_datetime = serializers.DateTimeField().to_representation
+
+
+def choice_labels(model, field):
+    """{value: label} for a choices field."""
+    return {
+        value: str(label) for value, label in model._meta.get_field(field).flatchoices
+    }
+
+
+class Projection:
+    """
+    Subclasses list the `.values()` columns they read in `columns` and turn
+    a page of rows into response data in `serialize`.
+    """
+
+    columns = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.request = self.context.get("request")
+
+    def values(self, queryset):
+        # Prefetches only apply to model instances
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def file_url(self, model, field, name):
+        """The URL a serializer's FileField/ImageField gives `name`."""
+        if not name:
+            return None
+        url = model._meta.get_field(field).storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+    def serialize(self, rows):
+        raise NotImplementedError
+
+
+class ProjectionListMixin:
+    """Serve `list` from `list_projection` (a Projection subclass)."""
+
+    list_projection = None
+
+    def list(self, request, *args, **kwargs):
+        if self.list_projection is None or sparse_params(request) is not None:
+            return super().list(request, *args, **kwargs)
+
+        projection = self.list_projection(self.get_serializer_context())
+        rows = projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.serialize(page))
+        return Response(projection.serialize(list(rows)))
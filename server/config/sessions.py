@@ -0,0 +1,60 @@
+"""
+Session engine that coalesces expiry refresh writes.
+
+Reads go through the cache like `cached_db`. Rather than rewriting the
+session row on every request (SESSION_SAVE_EVERY_REQUEST) just to push the
+expiry forward, a loaded session marks itself modified once
+SESSION_REFRESH_FRACTION of its lifetime has passed since the last write,
+so the middleware saves it then and only then. A session stays alive as
+long as the user is active at least once every
+(1 - SESSION_REFRESH_FRACTION) * SESSION_COOKIE_AGE seconds.
+
+Expired rows are purged in batches by `manage.py clearsessions`.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils import timezone
+
+# Epoch seconds of the last write, kept alongside the session data
+WRITTEN_AT_KEY = "_session_written_at"
+
+# Expired sessions deleted per statement by clear_expired()
+PURGE_BATCH_SIZE = 1000
+
+
+class SessionStore(CachedDBStore):
+    def load(self):
+        data = super().load()
+        if data and self._refresh_due(data.get(WRITTEN_AT_KEY)):
+            self.modified = True
+        return data
+
+    def save(self, must_create=False):
+        self._session[WRITTEN_AT_KEY] = int(time.time())
+        super().save(must_create)
+
+    def _refresh_due(self, written_at):
+        if written_at is None:
+            return True
+        refresh_after = (
+            self.get_session_cookie_age() * settings.SESSION_REFRESH_FRACTION
+        )
+        return time.time() - written_at >= refresh_after
+
+    @classmethod
+    def clear_expired(cls):
+        # Short batches keep each DELETE's locks brief on a large table
+        model = cls.get_model_class()
+        now = timezone.now()
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now).values_list(
+                    "session_key", flat=True
+                )[:PURGE_BATCH_SIZE]
+            )
+            if not keys:
+                break
+            model.objects.filter(session_key__in=keys).delete()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 import dj_database_url
 from dotenv import load_dotenv
@@ -46,8 +47,10 @@ INSTALLED_APPS = [
     "rest_framework",
     "corsheaders",
     # Custom apps
+    "config",
     "users",
     "club",
+    "jobs",
 ]
 
 MIDDLEWARE = [
@@ -96,9 +99,52 @@ DATABASES = {
 # We will address the cursor issue differently if it persists.
 
 
+# Cache
+# Local memory by default (per process). Set CACHE_URL to share one cache
+# between gunicorn workers:
+#   redis://host:6379/0          (requires the `redis` package)
+#   file:///var/tmp/portal-cache (single host only)
+CACHE_URL = os.environ.get("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith("file://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_URL.removeprefix("file://"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "nst-sdc-portal",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Password hashing (see users.hashers). Stored hashes with a different
+# iteration count are upgraded on the user's next login.
+PASSWORD_HASHERS = [
+    "users.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "1000000"))
+# Hashes run at once per server process; more logins wait for a slot.
+# Keep it at or below the cores per process and below gunicorn's --threads.
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", "2"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -140,6 +186,11 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
+# Session users are served from a cached projection when CACHE_URL points
+# at a shared cache (see users.backends)
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+USER_CACHE_TIMEOUT = int(os.environ.get("USER_CACHE_TIMEOUT", "300"))
+
 # Auth Redirects
 LOGIN_REDIRECT_URL = "/dashboard/"
 LOGOUT_REDIRECT_URL = "/login/"
@@ -155,11 +206,72 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.KeysetPagination",
+    # Reverse proxies in front of the app. Client IPs (e.g. for login
+    # throttling) come from REMOTE_ADDR when 0, otherwise from the
+    # X-Forwarded-For entry the outermost trusted proxy appended
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "0")),
 }
 
+# Signed API tokens (see users.tokens), lifetimes in seconds
+ACCESS_TOKEN_LIFETIME = int(os.environ.get("ACCESS_TOKEN_LIFETIME", "900"))
+REFRESH_TOKEN_LIFETIME = int(os.environ.get("REFRESH_TOKEN_LIFETIME", "604800"))
+
+# Login brute-force throttling (see users.throttling): failed attempts
+# allowed per client IP and per username within the window, in seconds.
+# Use users.throttling.CacheSlidingWindowLimiter to share counts across
+# workers through CACHES.
+LOGIN_THROTTLE_BACKEND = os.environ.get(
+    "LOGIN_THROTTLE_BACKEND", "users.throttling.SlidingWindowLimiter"
+)
+LOGIN_IP_LIMIT = int(os.environ.get("LOGIN_IP_LIMIT", "20"))
+LOGIN_USERNAME_LIMIT = int(os.environ.get("LOGIN_USERNAME_LIMIT", "5"))
+LOGIN_THROTTLE_WINDOW = int(os.environ.get("LOGIN_THROTTLE_WINDOW", "300"))
+
+# Pagination
+# Default and maximum page sizes for cursor-paginated list endpoints
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "200"))
+# Hard cap on the leaderboard's `limit` query parameter
+LEADERBOARD_MAX_LIMIT = int(os.environ.get("LEADERBOARD_MAX_LIMIT", "100"))
+
+# Seconds a dashboard fragment may be served before it is rebuilt,
+# even if no signal invalidated it
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", "300"))
+
+# Seconds a cached API response lives (see config.cache.cached_response);
+# writes invalidate earlier by bumping the namespace version
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", "60"))
+LEADERBOARD_CACHE_TIMEOUT = int(os.environ.get("LEADERBOARD_CACHE_TIMEOUT", "30"))
+
+# Background jobs (see jobs.queue). JOBS_RUN_INLINE=1 runs jobs in the web
+# process after commit, for when no `manage.py runworker` is running; it is
+# the default with DEBUG, so set JOBS_RUN_INLINE=0 next to a worker.
+JOBS_RUN_INLINE = os.environ.get("JOBS_RUN_INLINE", "1" if DEBUG else "0") == "1"
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+# Base retry delay in seconds, doubled after each failed attempt
+JOB_RETRY_BACKOFF = int(os.environ.get("JOB_RETRY_BACKOFF", "10"))
+# Seconds after which a running job whose worker vanished is run again
+JOB_LOCK_TIMEOUT = int(os.environ.get("JOB_LOCK_TIMEOUT", "600"))
+# Seconds between a running job's lock refreshes; well below JOB_LOCK_TIMEOUT
+JOB_HEARTBEAT_INTERVAL = int(os.environ.get("JOB_HEARTBEAT_INTERVAL", "60"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1.0"))
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", "7"))
+
+# Calendar feed (see club.calendar)
+# Seconds calendar apps may reuse a feed, and how far back it goes
+CALENDAR_FEED_MAX_AGE = int(os.environ.get("CALENDAR_FEED_MAX_AGE", "3600"))
+CALENDAR_FEED_PAST_DAYS = int(os.environ.get("CALENDAR_FEED_PAST_DAYS", "90"))
+
+# Event self check-in (see club.checkin)
+CHECKIN_CODE_MAX_AGE = int(os.environ.get("CHECKIN_CODE_MAX_AGE", "900"))
+CHECKIN_FLUSH_SIZE = int(os.environ.get("CHECKIN_FLUSH_SIZE", "200"))
+CHECKIN_FLUSH_INTERVAL = float(os.environ.get("CHECKIN_FLUSH_INTERVAL", "2.0"))
+
 # CORS
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -180,4 +292,7 @@ SESSION_COOKIE_SECURE = False
 CSRF_COOKIE_SECURE = False
 SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_HTTPONLY = False  # Allows frontend to read CSRF token if needed
-SESSION_SAVE_EVERY_REQUEST = True
+# Cache-backed sessions that rewrite the expiry once this fraction of the
+# session's lifetime has passed (see config.sessions)
+SESSION_ENGINE = "config.sessions"
+SESSION_REFRESH_FRACTION = float(os.environ.get("SESSION_REFRESH_FRACTION", "0.5"))
@@ -0,0 +1,165 @@
+"""
+Sparse fieldsets and opt-in expansion of nested details.
+
+`?fields=id,name,status` limits a response to the listed top-level fields,
+and `?expand=lead,contributors` names the relations whose nested
+`*_details` are wanted. Without either parameter responses are unchanged;
+once a client sends one, nested details are only included for the
+relations it expands (or whose details field it lists in `fields`).
+
+`SparseFieldsMixin` applies the parameters to a serializer that has the
+request in its context. Serializers declare, in Meta:
+
+- `expandable`: {relation: details field}, e.g. {"lead": "lead_details"}
+- `field_columns`: the columns read by fields whose source isn't a model
+  field, e.g. {"status_display": ("status",)}; `rel__col` paths follow a
+  foreign key
+
+`SparseQuerysetMixin` then shrinks a viewset's list/retrieve queryset to
+match: select_related and prefetch_related only for relations that are
+still serialized, and only() for the columns the remaining fields read.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _split(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def sparse_params(request):
+    """(fields, expand) from the query string; fields is None if not limited."""
+    params = getattr(request, "query_params", None)
+    if params is None or not ("fields" in params or "expand" in params):
+        return None
+    fields = set(_split(params["fields"])) if "fields" in params else None
+    return fields, set(_split(params.get("expand")))
+
+
+class SparseFieldsMixin:
+    """Serializer mixin: drop the fields `?fields=` and `?expand=` leave out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        params = sparse_params(self._context.get("request"))
+        if params is None:
+            return
+        fields, expand = params
+
+        details = getattr(self.Meta, "expandable", {})
+        drop = {
+            field
+            for relation, field in details.items()
+            if relation not in expand and field not in (fields or ())
+        }
+        if fields is not None:
+            keep = fields | {details[name] for name in expand if name in details}
+            drop |= set(self.fields) - keep
+        for name in drop:
+            self.fields.pop(name, None)
+
+
+class UnknownSource(Exception):
+    pass
+
+
+def _plan(model, serializer):
+    """
+    (columns, select_related, {prefetch: (model, columns)}) needed to
+    serialize `serializer`'s fields from `model` rows.
+    """
+    declared = getattr(getattr(serializer, "Meta", None), "field_columns", {})
+    columns, select, prefetch = {model._meta.pk.name}, set(), {}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.field_name in declared:
+            for path in declared[field.field_name]:
+                columns.add(path)
+                if "__" in path:
+                    select.add(path.rsplit("__", 1)[0])
+            continue
+
+        if len(field.source_attrs) != 1:
+            raise UnknownSource(field.field_name)
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            raise UnknownSource(field.field_name) from None
+        name = model_field.name
+        nested = getattr(field, "child", field)
+        if not isinstance(nested, serializers.BaseSerializer):
+            nested = None
+
+        if model_field.many_to_many or model_field.one_to_many:
+            related = model_field.related_model
+            related_columns = (
+                _plan(related, nested)[0] if nested else {related._meta.pk.name}
+            )
+            prefetch.setdefault(name, (related, set()))[1].update(related_columns)
+        elif model_field.is_relation and nested is not None:
+            # Nested forward relation: join it and load only what it reads
+            related_columns, related_select, related_prefetch = _plan(
+                model_field.related_model, nested
+            )
+            if related_prefetch:
+                raise UnknownSource(field.field_name)
+            select.add(name)
+            select.update(f"{name}__{path}" for path in related_select)
+            columns.update(f"{name}__{path}" for path in related_columns)
+        else:
+            columns.add(name)
+
+    return columns, select, prefetch
+
+
+def optimize_queryset(queryset, serializer, extra_columns=()):
+    """
+    `queryset` with select_related, prefetch_related and only() set for
+    exactly what `serializer` reads; unchanged if some field's source is
+    unknown, since deferring a column it reads would cost a query per row.
+    """
+    try:
+        columns, select, prefetch = _plan(queryset.model, serializer)
+    except UnknownSource:
+        return queryset
+    for name in extra_columns:
+        try:
+            queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue  # an annotation, e.g. a search rank
+        columns.add(name)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*select)
+    for name, (related, related_columns) in prefetch.items():
+        queryset = queryset.prefetch_related(
+            Prefetch(name, queryset=related._default_manager.only(*related_columns))
+        )
+    return queryset.only(*columns)
+
+
+class SparseQuerysetMixin:
+    """
+    Viewset mixin: shrink the list/retrieve queryset to the fields requested
+    with `?fields=`/`?expand=`. Cursor ordering columns are always loaded.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        if sparse_params(self.request) is None:
+            return queryset
+
+        ordering = getattr(self, "cursor_ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return optimize_queryset(
+            queryset,
+            self.get_serializer(),
+            extra_columns=[name.lstrip("-") for name in ordering],
+        )
@@ -0,0 +1,85 @@
+"""
+Filtering and counting on JSON list-of-strings columns (Project.tech_stack,
+User.tech_skills).
+
+On PostgreSQL the filters are jsonb containment (`@>`), served by GIN
+jsonb_path_ops indexes created in migrations. Databases without JSON
+containment (SQLite) instead query a normalized side table with one row per
+(owner, tag), which `sync_tags` rewrites whenever the owner is saved.
+"""
+
+from django.db import connection
+from django.db.models import Count, Q
+
+
+def uses_side_table():
+    return not connection.features.supports_json_field_contains
+
+
+def parse_tags(value):
+    """Split a comma-separated query parameter into tags."""
+    return [tag.strip() for tag in (value or "").split(",") if tag.strip()]
+
+
+def filter_by_tags(queryset, field, tag_model, owner_field, tags, match_all=False):
+    """
+    Rows whose JSON list `field` contains any (or, with `match_all`, every)
+    tag in `tags`. `tag_model` is the side table, with a `name` column and a
+    foreign key `owner_field` back to the queryset's model.
+    """
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return queryset
+
+    if not uses_side_table():
+        if match_all:
+            return queryset.filter(**{f"{field}__contains": tags})
+        condition = Q()
+        for tag in tags:
+            condition |= Q(**{f"{field}__contains": [tag]})
+        return queryset.filter(condition)
+
+    owner_id = f"{owner_field}_id"
+    owners = tag_model.objects.filter(name__in=tags).values(owner_id)
+    if match_all:
+        owners = (
+            owners.annotate(matched=Count("id"))
+            .filter(matched=len(tags))
+            .values(owner_id)
+        )
+    return queryset.filter(pk__in=owners)
+
+
+def sync_tags(instance, field, tag_model, owner_field):
+    """Rewrite the side-table rows for `instance`; a no-op on PostgreSQL."""
+    if not uses_side_table():
+        return
+    tags = {tag for tag in getattr(instance, field) or [] if isinstance(tag, str)}
+    tag_model.objects.filter(**{owner_field: instance}).delete()
+    tag_model.objects.bulk_create(
+        [tag_model(**{owner_field: instance}, name=tag) for tag in tags]
+    )
+
+
+def count_tags(queryset, field, tag_model, owner_field):
+    """[(tag, count)] over the rows of `queryset`, most common first."""
+    if uses_side_table():
+        rows = (
+            tag_model.objects.filter(**{f"{owner_field}__in": queryset.values("pk")})
+            .values_list("name")
+            .annotate(count=Count("id"))
+            .order_by("-count", "name")
+        )
+        return list(rows)
+
+    # jsonb: unnest each filtered row's array and group the elements
+    inner, params = queryset.order_by().values(field).query.sql_with_params()
+    column = connection.ops.quote_name(field)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tag, COUNT(*) FROM ({inner}) AS owner,"
+            f" jsonb_array_elements_text(coalesce(owner.{column}, '[]'::jsonb))"
+            " AS tag GROUP BY tag ORDER BY 2 DESC, 1",
+            params,
+        )
+        return cursor.fetchall()
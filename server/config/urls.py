@@ -17,11 +17,13 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from .views import health_check
+from .views import cache_stats, health_check, job_stats
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("users.urls")),
     path("api/", include("club.urls")),
     path("head/", health_check, name="health_check"),
+    path("api/cache/stats/", cache_stats, name="api-cache-stats"),
+    path("api/jobs/stats/", job_stats, name="api-job-stats"),
 ]
@@ -1,5 +1,26 @@
 from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from jobs.queue import get_stats as get_job_stats
+
+from .cache import get_stats
 
 
 def health_check(request):
     return HttpResponse(status=200)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def cache_stats(request):
+    """Hit/miss counters for the API response caches."""
+    return Response(get_stats())
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def job_stats(request):
+    """Per-task counts and timings for background jobs."""
+    return Response(get_job_stats())
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "task",
+        "status",
+        "attempts",
+        "run_at",
+        "wait_ms",
+        "run_ms",
+        "created_at",
+    )
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    readonly_fields = ("created_at", "started_at", "finished_at", "locked_at")
@@ -0,0 +1,119 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs.queue import claim, execute, purge_finished
+
+logger = logging.getLogger(__name__)
+
+# Seconds between purges of old finished jobs
+PURGE_INTERVAL = 3600
+
+
+def run_in_thread(job_id):
+    try:
+        return execute(job_id)
+    finally:
+        connections.close_all()
+
+
+def setup_process():
+    django.setup()
+
+
+def run_in_process(job_id):
+    close_old_connections()
+    return execute(job_id)
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (see jobs.queue)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=4, help="Jobs run at the same time"
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="Run jobs in threads (I/O-bound work) or processes (CPU-bound)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to sleep when no job is due",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        if options["pool"] == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=setup_process,
+            )
+            run = run_in_process
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+            run = run_in_thread
+
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        self.stdout.write(
+            f"Worker {worker_id}: {concurrency} {options['pool']} slots, "
+            f"polling every {options['poll_interval']}s"
+        )
+        running = set()
+        last_purge = None
+        try:
+            while not stopping.is_set():
+                if last_purge is None or time.monotonic() - last_purge > PURGE_INTERVAL:
+                    purge_finished()
+                    last_purge = time.monotonic()
+
+                job_ids = claim(worker_id, concurrency - len(running))
+                running |= {executor.submit(run, job_id) for job_id in job_ids}
+                if not running and options["once"]:
+                    break
+                if job_ids and len(running) < concurrency:
+                    # Free slots and more may be due: claim again right away
+                    continue
+                if running:
+                    done, running = wait_futures(
+                        running,
+                        timeout=options["poll_interval"],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        if future.exception() is not None:
+                            logger.error(
+                                "Worker failed to run a job",
+                                exc_info=future.exception(),
+                            )
+                else:
+                    stopping.wait(options["poll_interval"])
+        finally:
+            # Let running jobs finish; unclaimed ones stay queued
+            executor.shutdown(wait=True)
+            self.stdout.write(f"Worker {worker_id} stopped")
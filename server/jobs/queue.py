@@ -0,0 +1,213 @@
+"""
+Database-backed job queue.
+
+Functions decorated with `@job` can be deferred with `func.delay(*args,
+**kwargs)`, which inserts a Job row in the caller's transaction, so the job
+only exists if that transaction commits. Arguments must be JSON
+serializable. `manage.py runworker` claims due jobs and runs them in a
+thread or process pool.
+
+Claiming uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports
+it (PostgreSQL), so concurrent workers never block on or double-claim a
+row. Elsewhere (SQLite) each candidate is claimed with a conditional UPDATE
+and a worker that loses the race simply moves on. A failed job is retried
+with exponential backoff up to its `max_attempts`. While a job runs, its
+worker refreshes `locked_at` every JOB_HEARTBEAT_INTERVAL seconds; a job
+left `running` by a worker that died stops being refreshed and is reclaimed
+after JOB_LOCK_TIMEOUT seconds.
+
+With JOBS_RUN_INLINE set (the default when DEBUG is on), `delay()` runs the
+function right after the transaction commits instead, for development
+without a worker.
+"""
+
+import functools
+import importlib
+import logging
+import random
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Job name (dotted path) -> function
+REGISTRY = {}
+
+
+def job(func=None, *, max_attempts=None, unique=False):
+    """
+    Register `func` as a job and give it a `delay()` method.
+    With `unique`, delay() is a no-op while an identical job is queued.
+    """
+
+    def decorate(func):
+        func.job_name = f"{func.__module__}.{func.__qualname__}"
+        func.max_attempts = max_attempts
+        func.unique = unique
+        func.delay = functools.partial(enqueue, func)
+        REGISTRY[func.job_name] = func
+        return func
+
+    return decorate(func) if func is not None else decorate
+
+
+def enqueue(func, *args, **kwargs):
+    """Queue `func(*args, **kwargs)`; returns the Job (None if skipped)."""
+    if settings.JOBS_RUN_INLINE:
+        transaction.on_commit(functools.partial(_run_inline, func, args, kwargs))
+        return None
+
+    fields = {"task": func.job_name, "args": list(args), "kwargs": kwargs}
+    if func.unique and Job.objects.filter(status="queued", **fields).exists():
+        return None
+    return Job.objects.create(
+        max_attempts=func.max_attempts or settings.JOB_MAX_ATTEMPTS, **fields
+    )
+
+
+def _run_inline(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Inline job %s failed", func.job_name)
+
+
+def get_task(name):
+    if name not in REGISTRY:
+        # Importing the module runs its @job decorators
+        importlib.import_module(name.rsplit(".", 1)[0])
+    return REGISTRY[name]
+
+
+def claim(worker_id, limit):
+    """Mark up to `limit` due jobs as running for `worker_id`; returns their ids."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    due = Job.objects.filter(
+        Q(status="queued", run_at__lte=now) | Q(status="running", locked_at__lt=stale)
+    ).order_by("run_at", "id")
+    claimed = {
+        "status": "running",
+        "locked_by": worker_id,
+        "locked_at": now,
+        "started_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[
+                    :limit
+                ]
+            )
+            Job.objects.filter(pk__in=ids).update(**claimed)
+        return ids
+
+    # No row locks: the UPDATE only matches if nobody claimed the row first
+    ids = []
+    for candidate in due.values("id", "status", "locked_at")[:limit]:
+        if Job.objects.filter(**candidate).update(**claimed):
+            ids.append(candidate["id"])
+    return ids
+
+
+def retry_delay(attempts):
+    """Seconds before retry number `attempts`: exponential with jitter."""
+    delay = settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return min(delay, 3600) * random.uniform(0.5, 1.0)
+
+
+@contextmanager
+def heartbeat(job):
+    """Refresh `job`'s lock while the block runs, so it isn't reclaimed."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(
+                        pk=job.pk, status="running", locked_by=job.locked_by
+                    ).update(locked_at=timezone.now())
+                except Exception:
+                    logger.exception("Heartbeat of job %s failed", job.pk)
+        finally:
+            # Connections are per thread; close this one's
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def execute(job_id):
+    """Run one claimed job and record its outcome and timing."""
+    job = Job.objects.get(pk=job_id)
+    wait_ms = (job.started_at - job.run_at).total_seconds() * 1000
+    started = time.perf_counter()
+    outcome = {"status": "done", "last_error": ""}
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError("Worker was lost while running this job")
+        with heartbeat(job):
+            get_task(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        logger.exception("Job %s (%s) failed", job.pk, job.task)
+        outcome["last_error"] = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            outcome["status"] = "queued"
+            outcome["run_at"] = timezone.now() + timedelta(
+                seconds=retry_delay(job.attempts)
+            )
+        else:
+            outcome["status"] = "failed"
+
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        finished_at=timezone.now(),
+        wait_ms=wait_ms,
+        run_ms=(time.perf_counter() - started) * 1000,
+        locked_at=None,
+        **outcome,
+    )
+    return outcome["status"]
+
+
+def purge_finished():
+    """Delete finished jobs older than JOB_RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    return Job.objects.filter(status="done", finished_at__lt=cutoff).delete()[0]
+
+
+def get_stats():
+    """Per-task counts by status and timing of retained jobs."""
+    rows = (
+        Job.objects.values("task")
+        .annotate(
+            queued=Count("id", filter=Q(status="queued")),
+            running=Count("id", filter=Q(status="running")),
+            done=Count("id", filter=Q(status="done")),
+            failed=Count("id", filter=Q(status="failed")),
+            avg_wait_ms=Avg("wait_ms", filter=Q(status="done")),
+            avg_run_ms=Avg("run_ms", filter=Q(status="done")),
+            max_run_ms=Max("run_ms", filter=Q(status="done")),
+        )
+        .order_by("task")
+    )
+    return {row.pop("task"): row for row in rows}
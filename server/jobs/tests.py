@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim, execute, heartbeat, job
+
+
+@job(max_attempts=2)
+def failing_job():
+    raise RuntimeError("boom")
+
+
+@job
+def working_job():
+    pass
+
+
+@override_settings(JOBS_RUN_INLINE=False, JOB_RETRY_BACKOFF=10)
+class RetryTests(TestCase):
+    def run_due(self):
+        ids = claim("worker-1", 10)
+        with self.assertLogs("jobs.queue", "ERROR"):
+            return [execute(job_id) for job_id in ids]
+
+    def test_failed_job_is_retried_with_backoff_then_fails(self):
+        queued = failing_job.delay()
+        before = timezone.now()
+        self.assertEqual(self.run_due(), ["queued"])
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("RuntimeError: boom", queued.last_error)
+        self.assertIsNone(queued.locked_at)
+        # First retry waits 5-10s (JOB_RETRY_BACKOFF with jitter)
+        self.assertGreaterEqual(queued.run_at, before + timedelta(seconds=5))
+        self.assertLessEqual(queued.run_at, timezone.now() + timedelta(seconds=10))
+        self.assertEqual(claim("worker-1", 10), [])
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertEqual(self.run_due(), ["failed"])
+        queued.refresh_from_db()
+        self.assertEqual(queued.attempts, 2)
+
+    def test_successful_job_is_done(self):
+        queued = working_job.delay()
+        self.assertEqual(
+            [execute(job_id) for job_id in claim("worker-1", 10)], ["done"]
+        )
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("done", 1))
+
+    @override_settings(JOB_LOCK_TIMEOUT=60)
+    def test_stale_running_job_is_reclaimed(self):
+        queued = working_job.delay()
+        claim("worker-1", 10)
+        Job.objects.filter(pk=queued.pk).update(
+            locked_at=timezone.now() - timedelta(seconds=61)
+        )
+        self.assertEqual(claim("worker-2", 10), [queued.pk])
+        queued.refresh_from_db()
+        self.assertEqual((queued.locked_by, queued.attempts), ("worker-2", 2))
+
+
+# The heartbeat writes from its own thread and connection, which only sees
+# committed rows
+@override_settings(JOB_HEARTBEAT_INTERVAL=0.05)
+class HeartbeatTests(TransactionTestCase):
+    def test_heartbeat_refreshes_lock_while_running(self):
+        stale = timezone.now() - timedelta(minutes=5)
+        running = Job.objects.create(
+            task=working_job.job_name,
+            status="running",
+            locked_by="worker-1",
+            locked_at=stale,
+        )
+        with heartbeat(running):
+            time.sleep(0.3)
+        running.refresh_from_db()
+        self.assertGreater(running.locked_at, stale)
+
+    def test_heartbeat_leaves_a_reclaimed_job_alone(self):
+        stale = timezone.now() - timedelta(minutes=5)
+        running = Job.objects.create(
+            task=working_job.job_name,
+            status="running",
+            locked_by="worker-1",
+            locked_at=stale,
+        )
+        # Another worker took the job over
+        Job.objects.filter(pk=running.pk).update(locked_by="worker-2")
+        with heartbeat(running):
+            time.sleep(0.3)
+        running.refresh_from_db()
+        self.assertEqual(running.locked_at, stale)
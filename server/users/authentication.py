@@ -0,0 +1,29 @@
+from rest_framework import authentication, exceptions
+
+from .tokens import InvalidToken, read_access_token, user_from_claims
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """
+    `Authorization: Bearer <access token>` authentication.
+    The token is checked from its signature alone; request.user is built
+    from its claims, so permission checks on role flags need no query.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = authentication.get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid Authorization header")
+
+        try:
+            claims = read_access_token(auth[1].decode())
+        except (InvalidToken, UnicodeDecodeError) as exc:
+            raise exceptions.AuthenticationFailed(str(exc)) from exc
+        return user_from_claims(claims), claims
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
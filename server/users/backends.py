@@ -0,0 +1,74 @@
+"""
+Authentication backend that serves session users from the cache.
+
+AuthenticationMiddleware resolves request.user through the backend's
+get_user() on every request. Here that returns a slim projection of the user
+(identity and role flags, plus the session auth hash in place of the password
+hash) cached under the user id for USER_CACHE_TIMEOUT seconds. Profile fields
+are deferred and loaded in one query if a view touches them.
+
+users.signals drops the entry whenever the user is saved or deleted, but
+only in the cache that worker can see. With a per-process cache (LocMem, the
+default without CACHE_URL) other workers would keep serving a deactivated
+user, or one whose password changed, until the entry expired, so users are
+only cached when the default cache is shared between workers.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+UserModel = get_user_model()
+
+# Fields kept in the cached projection
+CACHED_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_member",
+    "is_club_admin",
+)
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def cache_is_shared():
+    """Whether every worker sees (and invalidates) the same cache entries."""
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not cache_is_shared():
+            return super().get_user(user_id)
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            values = {field: getattr(user, field) for field in CACHED_FIELDS}
+            values["session_auth_hash"] = user.get_session_auth_hash()
+            cache.set(key, values, settings.USER_CACHE_TIMEOUT)
+            return user
+
+        values = dict(values)
+        session_auth_hash = values.pop("session_auth_hash")
+        user = UserModel.partial(**values)
+        user._session_auth_hash = session_auth_hash
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,47 @@
+"""
+PBKDF2 password hashing with a configured cost and a bounded concurrency.
+
+The cost is set explicitly by PASSWORD_HASH_ITERATIONS. Django's
+check_password() rehashes a user's password on their next successful login
+whenever the stored iteration count differs, so raising or lowering the
+setting migrates users as they log in.
+
+Hashing runs on the request thread: hashlib.pbkdf2_hmac releases the GIL,
+so with gunicorn's threaded (gthread) workers the other threads of a worker
+keep serving requests during a login. At most PASSWORD_HASH_CONCURRENCY
+hashes run at once per worker process; further logins wait for a slot, so
+a burst of logins can't take every core from the rest of the API.
+`manage.py bench_password_hashing` measures both.
+"""
+
+import threading
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Semaphore per PASSWORD_HASH_CONCURRENCY value, so overriding the setting
+# (benchmarks, tests) takes effect
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def hash_slots():
+    """The semaphore bounding concurrent hashes in this process."""
+    size = settings.PASSWORD_HASH_CONCURRENCY
+    with _slots_lock:
+        if size not in _slots:
+            _slots[size] = threading.BoundedSemaphore(size)
+        return _slots[size]
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """Django's PBKDF2-SHA256 hasher with the cost and bound from settings."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        # verify() and check_password() hash through encode() too
+        with hash_slots():
+            return super().encode(password, salt, iterations)
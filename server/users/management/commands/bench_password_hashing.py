@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(sorted_values, p):
+    index = round(p / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Report p50/p99 login password-check latency and throughput, serial "
+        "and under concurrent load, for one or more PBKDF2 iteration counts. "
+        "Hashing releases the GIL, so logins/s scales with the threads up to "
+        "the hashing slots (PASSWORD_HASH_CONCURRENCY) and the cores"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            nargs="+",
+            default=[settings.PASSWORD_HASH_ITERATIONS],
+            help="PBKDF2 iteration counts to compare",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=8, help="Simultaneous logins"
+        )
+        parser.add_argument(
+            "--logins", type=int, default=64, help="Logins per iteration count"
+        )
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=settings.PASSWORD_HASH_CONCURRENCY,
+            help="Hashes allowed to run at once",
+        )
+
+    def handle(self, *args, **options):
+        concurrency, logins = options["concurrency"], options["logins"]
+        self.stdout.write(f"{logins} logins per run, {options['slots']} hashing slots")
+        self.stdout.write(
+            f"{'iterations':>12} {'threads':>8} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'logins/s':>9}"
+        )
+
+        for iterations in options["iterations"]:
+            with override_settings(
+                PASSWORD_HASH_ITERATIONS=iterations,
+                PASSWORD_HASH_CONCURRENCY=options["slots"],
+            ):
+                for threads in sorted({1, concurrency}):
+                    self.run(iterations, threads, logins)
+
+    def run(self, iterations, concurrency, logins):
+        hasher = get_hasher("default")
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+
+        def login(_):
+            start = time.perf_counter()
+            check_password(PASSWORD, encoded)
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as threads:
+            started = time.perf_counter()
+            latencies = sorted(threads.map(login, range(logins)))
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{iterations:>12} {concurrency:>8} "
+            f"{percentile(latencies, 50) * 1000:>9.1f} "
+            f"{percentile(latencies, 99) * 1000:>9.1f} "
+            f"{logins / elapsed:>9.1f}"
+        )
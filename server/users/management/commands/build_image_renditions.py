@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from config.images import REGISTRY, needs_renditions, update_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate missing image renditions for existing media"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render images that already have renditions",
+        )
+
+    def handle(self, *args, **options):
+        for model, field, sizes, namespaces in REGISTRY:
+            rendered = failed = 0
+            queryset = model.objects.exclude(**{field: ""}).exclude(
+                **{f"{field}__isnull": True}
+            )
+            queryset = queryset.only("pk", field, f"{field}_renditions")
+            for instance in queryset.iterator():
+                if not options["force"] and not needs_renditions(instance, field):
+                    continue
+                if update_renditions(instance, field, sizes, namespaces):
+                    rendered += 1
+                else:
+                    failed += 1
+            self.stdout.write(
+                f"{model._meta.label}.{field}: {rendered} rendered, {failed} failed"
+            )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from config.cache import bump_version
+from users.ranking import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized leaderboard ranks from User.points"
+
+    def handle(self, *args, **options):
+        count = rebuild_leaderboard()
+        bump_version("leaderboard")
+        self.stdout.write(self.style.SUCCESS(f"Ranked {count} members"))
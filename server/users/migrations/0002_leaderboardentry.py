@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_leaderboard(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    LeaderboardEntry = apps.get_model("users", "LeaderboardEntry")
+
+    entries = []
+    rank, previous_points = 0, None
+    members = User.objects.filter(is_active=True, is_member=True).order_by("-points")
+    for position, (user_id, points) in enumerate(
+        members.values_list("id", "points"), start=1
+    ):
+        if points != previous_points:
+            rank, previous_points = position, points
+        entries.append(LeaderboardEntry(user_id=user_id, points=points, rank=rank))
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="leaderboard_entry",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("points", models.IntegerField(default=0)),
+                (
+                    "rank",
+                    models.PositiveIntegerField(
+                        help_text="Competition rank: 1 + number of members with more points"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Leaderboard entry",
+                "verbose_name_plural": "Leaderboard entries",
+                "ordering": ["rank", "user_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["rank", "user"], name="users_leade_rank_23dff7_idx"
+                    ),
+                    models.Index(
+                        fields=["points"], name="users_leade_points_777b0a_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_leaderboard, migrations.RunPython.noop),
+    ]
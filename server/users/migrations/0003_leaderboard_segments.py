@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:43
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_segments(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    LeaderboardEntry = apps.get_model("users", "LeaderboardEntry")
+
+    user = User.objects.filter(pk=OuterRef("user_id"))
+    LeaderboardEntry.objects.update(
+        batch_year=Subquery(user.values("batch_year")[:1]),
+        skill_level=Subquery(user.values("skill_level")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_leaderboardentry"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="leaderboardentry",
+            name="users_leade_points_777b0a_idx",
+        ),
+        migrations.AddField(
+            model_name="leaderboardentry",
+            name="batch_year",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="leaderboardentry",
+            name="skill_level",
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["points", "user"], name="users_leade_points_f3c7be_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["batch_year", "points", "user"],
+                name="users_leade_batch_y_3fec20_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["skill_level", "points", "user"],
+                name="users_leade_skill_l_f0aa3a_idx",
+            ),
+        ),
+        migrations.RunPython(copy_segments, migrations.RunPython.noop),
+    ]
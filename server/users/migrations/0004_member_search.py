@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:10
+
+from django.db import migrations
+
+# Kept in step with users.search
+SEARCH_TEXT = (
+    "lower(coalesce(username, '') || ' ' || coalesce(first_name, '') || ' '"
+    " || coalesce(last_name, '') || ' ' || coalesce(email, ''))"
+)
+
+POSTGRES_FORWARDS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE users_user ADD COLUMN search_text text"
+    f" GENERATED ALWAYS AS ({SEARCH_TEXT}) STORED",
+    f"ALTER TABLE users_user ADD COLUMN search_vector tsvector"
+    f" GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {SEARCH_TEXT})) STORED",
+    "CREATE INDEX users_user_search_vector_idx ON users_user USING gin (search_vector)",
+    "CREATE INDEX users_user_search_text_trgm_idx ON users_user"
+    " USING gin (search_text gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARDS = [
+    "ALTER TABLE users_user DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE users_user DROP COLUMN IF EXISTS search_text",
+]
+
+SQLITE_FORWARDS = [
+    "CREATE VIRTUAL TABLE users_user_fts USING fts5("
+    "username, first_name, last_name, email, tokenize='trigram')",
+    "INSERT INTO users_user_fts (rowid, username, first_name, last_name, email)"
+    " SELECT id, username, coalesce(first_name, ''), coalesce(last_name, ''),"
+    " coalesce(email, '') FROM users_user",
+]
+
+SQLITE_BACKWARDS = ["DROP TABLE IF EXISTS users_user_fts"]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for statement in statements.get(vendor, ()):
+            schema_editor.execute(statement)
+
+    return apply
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_leaderboard_segments"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"postgresql": POSTGRES_FORWARDS, "sqlite": SQLITE_FORWARDS}),
+            run({"postgresql": POSTGRES_BACKWARDS, "sqlite": SQLITE_BACKWARDS}),
+        ),
+    ]
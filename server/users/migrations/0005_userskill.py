@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS users_user_tech_skills_gin ON users_user"
+            " USING gin (tech_skills jsonb_path_ops)"
+        )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS users_user_tech_skills_gin")
+
+
+def backfill_tags(apps, schema_editor):
+    # The side table is only read where JSON containment is unavailable
+    if schema_editor.connection.features.supports_json_field_contains:
+        return
+    Owner = apps.get_model("users", "User")
+    Tag = apps.get_model("users", "UserSkill")
+    Tag.objects.bulk_create(
+        [
+            Tag(user_id=pk, name=name)
+            for pk, names in Owner.objects.values_list("pk", "tech_skills")
+            for name in set(names or [])
+            if isinstance(name, str)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_member_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserSkill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="skill_tags",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["name", "user"], name="users_users_name_547add_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "name"), name="unique_user_skill"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router
 
 
 class User(AbstractUser):
@@ -17,6 +17,9 @@ class User(AbstractUser):
         upload_to="avatars/", blank=True, null=True, help_text="User profile picture"
     )
 
+    # Resized copies of the avatar (see config.images)
+    avatar_renditions = models.JSONField(default=dict, blank=True, editable=False)
+
     # Academic / Identify
     student_id = models.CharField(
         max_length=50, blank=True, null=True, help_text="Student ID / Roll Number"
@@ -110,6 +113,34 @@ class User(AbstractUser):
     def __str__(self):
         return self.email or self.username
 
+    @classmethod
+    def partial(cls, **values):
+        """
+        An instance holding only `values`, as if loaded from the database
+        with .only(); the remaining fields load on first access.
+        """
+        # from_db() expects values in model field order
+        fields = [f.attname for f in cls._meta.concrete_fields if f.attname in values]
+        return cls.from_db(
+            router.db_for_read(cls), fields, [values[name] for name in fields]
+        )
+
+    def get_session_auth_hash(self):
+        # Users cached by users.backends carry this hash, not the password
+        if "password" in self.get_deferred_fields() and hasattr(
+            self, "_session_auth_hash"
+        ):
+            return self._session_auth_hash
+        return super().get_session_auth_hash()
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Partial users (token claims, cached projections) defer most
+        # fields; load them all on first access, not one query per field
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
+
     def get_full_name(self):
         """Return the user's full name."""
         full_name = f"{self.first_name} {self.last_name}".strip()
@@ -118,3 +149,64 @@ class User(AbstractUser):
     def get_short_name(self):
         """Return the user's short name."""
         return self.first_name or self.username
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized leaderboard rank for an active club member.
+    Maintained incrementally by users.ranking whenever points or membership
+    change, so leaderboard reads and rank lookups never re-sort the members.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="leaderboard_entry",
+    )
+
+    points = models.IntegerField(default=0)
+
+    rank = models.PositiveIntegerField(
+        help_text="Competition rank: 1 + number of members with more points"
+    )
+
+    # Segment keys copied from User so segmented rankings stay index-only
+    batch_year = models.IntegerField(blank=True, null=True)
+    skill_level = models.CharField(max_length=20, blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Leaderboard entry"
+        verbose_name_plural = "Leaderboard entries"
+        ordering = ["rank", "user_id"]
+        indexes = [
+            models.Index(fields=["rank", "user"]),  # Leaderboard pages
+            models.Index(fields=["points", "user"]),  # Rank shifts, around-me
+            models.Index(fields=["batch_year", "points", "user"]),
+            models.Index(fields=["skill_level", "points", "user"]),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.user}"
+
+
+class UserSkill(models.Model):
+    """
+    One row per User.tech_skills entry, for databases without JSON
+    containment (see config.tags). Maintained by users.signals.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="skill_tags")
+
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "name"], name="unique_user_skill"),
+        ]
+        indexes = [
+            models.Index(fields=["name", "user"]),  # ?skills= lookups
+        ]
+
+    def __str__(self):
+        return f"{self.user}: {self.name}"
@@ -0,0 +1,208 @@
+"""
+Incremental maintenance of the materialized leaderboard.
+
+Ranks use competition ranking (1 + number of members with strictly more
+points), matching the rank shown on the profile page. When a member's points
+move from `old` to `new`, only the members whose points lie between the two
+values change rank, so each update re-ranks just that band with one windowed
+UPDATE. The window counts every entry above the band, so the ranks it writes
+are absolute and can't drift.
+
+Updates are serialized with a transaction-level advisory lock on PostgreSQL
+(SQLite already serializes writers): two members moving at once would
+otherwise each rank the band without seeing the other's move. The member's
+points and membership are read after the lock is taken, so an update never
+writes a value an update that committed first has already replaced.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import Rank
+
+from .models import LeaderboardEntry, User
+
+# User fields copied onto LeaderboardEntry for ranking within a segment
+SEGMENT_FIELDS = ("batch_year", "skill_level")
+
+# User fields a leaderboard entry is derived from
+RANK_FIELDS = ("points", "is_active", "is_member", *SEGMENT_FIELDS)
+
+# pg_advisory_xact_lock key held while ranks are rewritten
+RANK_LOCK_KEY = 0x1EAD_B0A2
+
+
+def is_ranked(user):
+    """Only active club members appear on the leaderboard."""
+    return user.is_active and user.is_member
+
+
+def _lock_ranks():
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [RANK_LOCK_KEY])
+
+
+def _rerank(old_points, new_points):
+    """
+    Recompute the rank of every entry a move from `old_points` to
+    `new_points` affects. `None` means "not on the leaderboard", in which
+    case everyone below the other value is affected.
+    """
+    known = [points for points in (old_points, new_points) if points is not None]
+    low = min(known) if None not in (old_points, new_points) else None
+    high = max(known)
+
+    table = connection.ops.quote_name(LeaderboardEntry._meta.db_table)
+    rank = connection.ops.quote_name("rank")
+    window_filter, params = ("", [])
+    if low is not None:
+        window_filter, params = ("WHERE points >= %s", [low])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET {rank} = ranked.new_rank "
+            "FROM ("
+            "  SELECT user_id, RANK() OVER (ORDER BY points DESC) AS new_rank"
+            f"  FROM {table} {window_filter}"
+            ") AS ranked "
+            f"WHERE {table}.user_id = ranked.user_id AND {table}.points <= %s"
+            f" AND {table}.{rank} <> ranked.new_rank",
+            [*params, high],
+        )
+
+
+@transaction.atomic
+def sync_user_rank(user_id):
+    """Bring a user's leaderboard entry in line with their points/membership."""
+    _lock_ranks()
+    user = User.objects.filter(pk=user_id).only("id", *RANK_FIELDS).first()
+    entry = LeaderboardEntry.objects.select_for_update().filter(user_id=user_id).first()
+
+    if user is None or not is_ranked(user):
+        if entry is not None:
+            entry.delete()
+            _rerank(entry.points, None)
+        return None
+
+    segments = {field: getattr(user, field) for field in SEGMENT_FIELDS}
+
+    if entry is not None and entry.points == user.points:
+        changed = [f for f, v in segments.items() if getattr(entry, f) != v]
+        if changed:
+            for field in changed:
+                setattr(entry, field, segments[field])
+            entry.save(update_fields=changed)
+        return entry
+
+    old_points = entry.points if entry else None
+    if entry is None:
+        # Ranked by _rerank below
+        entry = LeaderboardEntry.objects.create(
+            user_id=user.pk, points=user.points, rank=0, **segments
+        )
+    else:
+        entry.points = user.points
+        for field, value in segments.items():
+            setattr(entry, field, value)
+        entry.save(update_fields=["points", *SEGMENT_FIELDS])
+
+    _rerank(old_points, user.points)
+    entry.refresh_from_db(fields=["rank"])
+    return entry
+
+
+@transaction.atomic
+def remove_user_rank(user):
+    """Drop `user` from the leaderboard (e.g. before the account is deleted)."""
+    _lock_ranks()
+    entry = LeaderboardEntry.objects.select_for_update().filter(user_id=user.pk).first()
+    if entry is not None:
+        entry.delete()
+        _rerank(entry.points, None)
+
+
+@transaction.atomic
+def rebuild_leaderboard():
+    """Recompute every rank from scratch in one windowed query."""
+    _lock_ranks()
+    ranked = (
+        User.objects.filter(is_active=True, is_member=True)
+        .annotate(rank=Window(expression=Rank(), order_by=F("points").desc()))
+        .values_list("id", "points", "rank", *SEGMENT_FIELDS)
+    )
+    entries = [
+        LeaderboardEntry(
+            user_id=user_id,
+            points=points,
+            rank=rank,
+            **dict(zip(SEGMENT_FIELDS, segment)),
+        )
+        for user_id, points, rank, *segment in ranked
+    ]
+
+    LeaderboardEntry.objects.all().delete()
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+def get_user_rank(user):
+    """Single-row lookup of a member's rank, or None if they are not ranked."""
+    return (
+        LeaderboardEntry.objects.filter(user_id=user.pk)
+        .values_list("rank", flat=True)
+        .first()
+    )
+
+
+def _assign_ranks(entries, segment):
+    """
+    Set `rank` on a contiguous slice of entries ordered by (-points, user_id).
+    Global ranks are already stored; ranks within a segment are derived from
+    one index range count above the first row of the slice.
+    """
+    if not entries or not segment:
+        return entries
+
+    top = entries[0].points
+    above = LeaderboardEntry.objects.filter(points__gte=top, **segment).aggregate(
+        greater=Count("pk", filter=Q(points__gt=top)), at_least=Count("pk")
+    )
+    tied_with_top = sum(1 for entry in entries if entry.points == top)
+
+    previous = None
+    for position, entry in enumerate(entries):
+        if entry.points == top:
+            entry.rank = above["greater"] + 1
+        elif entry.points != previous.points:
+            entry.rank = above["at_least"] + position - tied_with_top + 1
+        else:
+            entry.rank = previous.rank
+        previous = entry
+    return entries
+
+
+def top_entries(limit, **segment):
+    """The first `limit` ranked members, optionally within a segment."""
+    entries = LeaderboardEntry.objects.filter(**segment).select_related("user")
+    if segment:
+        entries = entries.order_by("-points", "user_id")
+    else:
+        entries = entries.order_by("rank", "user_id")
+    return _assign_ranks(list(entries[:limit]), segment)
+
+
+def entries_around(user, window, **segment):
+    """
+    Up to `window` members on either side of `user`, plus `user` themselves.
+    Both neighbours are keyset seeks on the (points, user) indexes.
+    """
+    entries = LeaderboardEntry.objects.filter(**segment).select_related("user")
+    entry = entries.filter(user_id=user.pk).first()
+    if entry is None:
+        return []
+
+    ahead = Q(points__gt=entry.points) | Q(points=entry.points, user_id__lt=user.pk)
+    behind = Q(points__lt=entry.points) | Q(points=entry.points, user_id__gt=user.pk)
+    above = entries.filter(ahead).order_by("points", "-user_id")[:window]
+    below = entries.filter(behind).order_by("-points", "user_id")[:window]
+
+    return _assign_ranks([*reversed(list(above)), entry, *below], segment)
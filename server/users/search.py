@@ -0,0 +1,152 @@
+"""
+Ranked, indexed member search over username, name and email.
+
+PostgreSQL: migration 0004 adds two generated columns to users_user,
+`search_vector` (tsvector) and `search_text` (lower-cased text), with GIN
+indexes on each (the latter with pg_trgm). A member matches when every term
+prefix-matches the vector, or when the query is a close trigram word match
+for the text, which catches typos. Results are ranked by ts_rank plus
+word similarity. Generated columns are kept current by the database itself.
+
+SQLite: an FTS5 table (`users_user_fts`, trigram tokenizer) shadows the same
+columns and is kept in sync by users.signals on save and delete. A query
+matches on any of its trigrams and is ranked by bm25, so near misses still
+match but rank below exact substrings. Terms shorter than three characters
+can't use trigrams; each must also be contained in one of the columns
+(LIKE), and a query made only of them falls back to icontains.
+
+Other databases fall back to the icontains filters.
+
+Results also get a unique `search_key` to page on: the rank to three
+decimals with the id in the low digits. Cursor pagination positions on its
+first ordering column alone, so pages ordered by a rank that ties (every
+icontains match ranks 0.0) would fall back to offsets and break past DRF's
+offset cutoff.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import (
+    BigIntegerField,
+    BooleanField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Q,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Floor
+
+FTS_TABLE = "users_user_fts"
+SEARCH_COLUMNS = ("username", "first_name", "last_name", "email")
+
+TERM_RE = re.compile(r"\w+")
+
+# search_key = rank bucket * ID_SPAN + id
+RANK_BUCKETS = 1000
+ID_SPAN = 10**10
+
+
+def search_users(queryset, query):
+    """
+    Filter `queryset` to users matching `query`, annotated with a
+    `search_rank` where higher is a better match and a unique `search_key`
+    in the same order, ties broken by id.
+    """
+    terms = TERM_RE.findall(query.lower())
+    if not terms:
+        queryset = queryset.none().annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+    elif connection.vendor == "postgresql":
+        queryset = _search_postgres(queryset, terms)
+    elif connection.vendor == "sqlite" and any(len(term) >= 3 for term in terms):
+        queryset = _search_sqlite(queryset, terms)
+    else:
+        queryset = _search_icontains(queryset, terms)
+    bucket = Cast(Floor(F("search_rank") * RANK_BUCKETS), BigIntegerField())
+    return queryset.annotate(
+        search_key=ExpressionWrapper(
+            bucket * ID_SPAN + F("id"), output_field=BigIntegerField()
+        )
+    )
+
+
+def _search_postgres(queryset, terms):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    text = " ".join(terms)
+    matches = RawSQL(
+        "users_user.search_vector @@ to_tsquery('simple', %s)"
+        " OR %s <%% users_user.search_text",
+        (tsquery, text),
+        output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        "ts_rank(users_user.search_vector, to_tsquery('simple', %s))"
+        " + word_similarity(%s, users_user.search_text)",
+        (tsquery, text),
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(search_rank=rank)
+
+
+def _search_sqlite(queryset, terms):
+    # Quoted strings are matched as substrings by the trigram tokenizer;
+    # the whole term ranks above the trigrams it is made of
+    grams = []
+    for term in terms:
+        if len(term) >= 3:
+            grams.append(term)
+            grams += [term[i : i + 3] for i in range(len(term) - 2)]
+        else:
+            queryset = _filter_icontains(queryset, term)
+    fts_query = " OR ".join(f'"{gram}"' for gram in dict.fromkeys(grams))
+
+    matched = RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (fts_query,)
+    )
+    rank = RawSQL(
+        f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE}"
+        f" WHERE {FTS_TABLE} MATCH %s AND rowid = users_user.id",
+        (fts_query,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(id__in=matched).annotate(search_rank=rank)
+
+
+def _filter_icontains(queryset, term):
+    return queryset.filter(
+        Q(username__icontains=term)
+        | Q(first_name__icontains=term)
+        | Q(last_name__icontains=term)
+        | Q(email__icontains=term)
+    )
+
+
+def _search_icontains(queryset, terms):
+    for term in terms:
+        queryset = _filter_icontains(queryset, term)
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def index_user(user):
+    """Write `user` to the SQLite FTS table; a no-op elsewhere."""
+    if connection.vendor != "sqlite":
+        return
+    values = [getattr(user, column) or "" for column in SEARCH_COLUMNS]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)})"
+            " VALUES (%s, %s, %s, %s, %s)",
+            [user.pk, *values],
+        )
+
+
+def unindex_user(user_id):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])
@@ -1,13 +1,17 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from config.images import SrcsetField
+from config.sparse import SparseFieldsMixin
+
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Full user serializer with all fields"""
 
     full_name = serializers.CharField(source="get_full_name", read_only=True)
+    avatar_srcset = SrcsetField(source="avatar_renditions")
 
     class Meta:
         model = User
@@ -25,6 +29,7 @@ class UserSerializer(serializers.ModelSerializer):
             "is_club_admin",
             "is_staff",
             "avatar",
+            "avatar_srcset",
             "bio",
             "github_username",
             "linkedin_url",
@@ -36,6 +41,7 @@ class UserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "points", "created_at", "updated_at", "is_staff"]
         extra_kwargs = {"password": {"write_only": True}}
+        field_columns = {"full_name": ("first_name", "last_name", "username")}
 
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
@@ -86,11 +92,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class LeaderboardSerializer(serializers.ModelSerializer):
+class LeaderboardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for leaderboard display"""
 
     full_name = serializers.CharField(source="get_full_name", read_only=True)
     rank = serializers.IntegerField(read_only=True)
+    avatar_srcset = SrcsetField(source="avatar_renditions")
 
     class Meta:
         model = User
@@ -99,12 +106,14 @@ class LeaderboardSerializer(serializers.ModelSerializer):
             "username",
             "full_name",
             "avatar",
+            "avatar_srcset",
             "points",
             "batch_year",
             "skill_level",
             "rank",
             "github_username",
         ]
+        field_columns = {"full_name": ("first_name", "last_name", "username")}
 
 
 class PasswordChangeSerializer(serializers.Serializer):
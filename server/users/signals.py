@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from config.cache import invalidate_on
+from config.images import register_renditions
+from config.tags import sync_tags
+
+from .backends import invalidate_user
+from .models import User, UserSkill
+from .ranking import RANK_FIELDS, remove_user_rank, sync_user_rank
+from .search import SEARCH_COLUMNS, index_user, unindex_user
+
+
+@receiver(post_save, sender=User)
+def update_leaderboard_rank(sender, instance, update_fields=None, **kwargs):
+    """Keep the materialized leaderboard in sync with admin edits and awards."""
+    if update_fields is not None and not set(RANK_FIELDS).intersection(update_fields):
+        return
+    sync_user_rank(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def drop_leaderboard_rank(sender, instance, **kwargs):
+    remove_user_rank(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    """Drop the cached session projection (see users.backends)."""
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the SQLite member search table in sync (see users.search)."""
+    if update_fields is not None and not set(SEARCH_COLUMNS).intersection(
+        update_fields
+    ):
+        return
+    index_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def drop_search_index(sender, instance, **kwargs):
+    unindex_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_user_skills(sender, instance, update_fields=None, **kwargs):
+    """Mirror tech_skills into UserSkill where it is used (see config.tags)."""
+    if update_fields is None or "tech_skills" in update_fields:
+        sync_tags(instance, "tech_skills", UserSkill, "user")
+
+
+# Registered after update_leaderboard_rank so the rank table is current
+# before cached leaderboards are invalidated
+invalidate_on("leaderboard", User, skip_fields=("last_login", "password"))
+invalidate_on("users", User, skip_fields=("last_login", "password"))
+
+# Avatars: list rows use 64px, profiles up to 256px
+register_renditions(
+    User,
+    "avatar",
+    sizes=[(64, 64), (128, 128), (256, 256)],
+    namespaces=("users", "leaderboard", "projects"),
+)
@@ -0,0 +1,212 @@
+import time
+from unittest import mock, skipIf
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from club.models import Attendance, Event
+
+from . import throttling
+from .search import search_users
+from .throttling import SlidingWindowLimiter
+from .tokens import InvalidToken, issue_tokens, read_access_token, refresh_tokens
+
+User = get_user_model()
+
+# The production hasher is deliberately slow
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True, points=30
+        )
+        User.objects.filter(pk=cls.member.pk).update(avatar="avatars/member.png")
+        User.objects.create_user(
+            "runner_up", "runner_up@example.com", "password", is_member=True, points=10
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def test_fields_narrows_the_response(self):
+        response = self.client.get("/api/leaderboard/?fields=id,username,rank")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            [
+                {"id": self.member.pk, "username": "member", "rank": 1},
+                {"id": response.data[1]["id"], "username": "runner_up", "rank": 2},
+            ],
+        )
+
+    def test_avatar_urls_are_absolute(self):
+        response = self.client.get("/api/leaderboard/?fields=avatar")
+        self.assertEqual(
+            response.data[0]["avatar"], "http://testserver/media/avatars/member.png"
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+        for i in range(5):
+            User.objects.create_user(
+                f"zz{i}", f"zz{i}@example.com", "password", is_member=True
+            )
+            event = Event.objects.create(
+                title=f"Meetup {i}", description="", event_date=timezone.now()
+            )
+            Attendance.objects.create(user=cls.member, event=event)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def follow(self, url):
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            results += response.data["results"]
+            url = response.data["next"]
+        return results
+
+    def test_tied_search_ranks_page_without_repeats(self):
+        # Two-letter terms take the icontains fallback, where every rank is 0
+        results = self.follow("/api/users/?search=zz&page_size=2")
+        self.assertCountEqual(
+            [user["username"] for user in results], [f"zz{i}" for i in range(5)]
+        )
+
+    def test_attendance_action_is_paginated(self):
+        url = f"/api/users/{self.member.pk}/attendance/?page_size=2"
+        self.assertEqual(len(self.client.get(url).data["results"]), 2)
+        self.assertEqual(len(self.follow(url)), 5)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            "member", "member@example.com", "password", is_member=True
+        )
+
+    def later(self, seconds):
+        return mock.patch("time.time", return_value=time.time() + seconds)
+
+    def test_access_token_expires(self):
+        access = issue_tokens(self.member)["access"]
+        self.assertEqual(read_access_token(access)["uid"], self.member.pk)
+        with self.later(settings.ACCESS_TOKEN_LIFETIME + 1):
+            with self.assertRaisesMessage(InvalidToken, "expired"):
+                read_access_token(access)
+
+    def test_expired_access_token_is_refreshed(self):
+        tokens = issue_tokens(self.member)
+        with self.later(settings.ACCESS_TOKEN_LIFETIME + 1):
+            response = APIClient().post(
+                "/api/auth/token/refresh/", {"refresh": tokens["refresh"]}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                read_access_token(response.data["access"])["uid"], self.member.pk
+            )
+
+    def test_refresh_token_expires(self):
+        refresh = issue_tokens(self.member)["refresh"]
+        with self.later(settings.REFRESH_TOKEN_LIFETIME + 1):
+            with self.assertRaisesMessage(InvalidToken, "expired"):
+                refresh_tokens(refresh)
+
+    def test_password_change_revokes_refresh_token(self):
+        refresh = issue_tokens(self.member)["refresh"]
+        self.member.set_password("changed")
+        self.member.save()
+        with self.assertRaises(InvalidToken):
+            refresh_tokens(refresh)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, LOGIN_USERNAME_LIMIT=3)
+class LoginThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user("member", "member@example.com", "password")
+
+    def setUp(self):
+        # Rebuild the limiters from the overridden settings, and drop them after
+        throttling._limiters = None
+        self.addCleanup(setattr, throttling, "_limiters", None)
+
+    def login(self, password):
+        return APIClient().post(
+            "/api/auth/login/", {"username": "member", "password": password}
+        )
+
+    def test_locks_out_after_limit(self):
+        for _ in range(3):
+            self.assertEqual(self.login("wrong").status_code, 400)
+        # Even the right password is refused while locked out
+        response = self.login("password")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_window_slides(self):
+        limiter = SlidingWindowLimiter("test", limit=2, window=60)
+        with mock.patch("time.monotonic", return_value=1000):
+            limiter.hit("key")
+        with mock.patch("time.monotonic", return_value=1030):
+            limiter.hit("key")
+            self.assertEqual(limiter.retry_after("key"), 30)
+        # The first hit has left the window; the second still counts
+        with mock.patch("time.monotonic", return_value=1060):
+            self.assertEqual(limiter.retry_after("key"), 0)
+            limiter.hit("key")
+            self.assertEqual(limiter.retry_after("key"), 30)
+
+    def test_success_resets_username_count(self):
+        for _ in range(2):
+            self.login("wrong")
+        self.assertEqual(self.login("password").status_code, 200)
+        for _ in range(2):
+            self.assertEqual(self.login("wrong").status_code, 400)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for username in ("smith", "smithers", "smitty", "bob", "abe"):
+            User.objects.create_user(username, f"{username}@example.org", "password")
+
+    def search(self, query):
+        return list(
+            search_users(User.objects.all(), query)
+            .order_by("-search_key")
+            .values_list("username", "search_rank")
+        )
+
+    def test_whole_term_ranks_above_partial_match(self):
+        results = self.search("smith")
+        self.assertEqual(
+            [username for username, _ in results], ["smith", "smithers", "smitty"]
+        )
+        self.assertGreater(results[0][1], results[1][1])
+
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL prefix-matches them")
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.search("ab"), [("abe", 0.0)])
+        self.assertEqual(self.search("  "), [])
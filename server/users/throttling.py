@@ -0,0 +1,143 @@
+"""
+Brute-force throttling for the login endpoint.
+
+Failed logins are counted per client IP and per username in a sliding
+window. Once either count reaches its limit, further attempts are refused
+with 429 before any password is hashed, so a credential-stuffing burst
+costs a dictionary lookup instead of a PBKDF2 run per attempt.
+
+LOGIN_THROTTLE_BACKEND picks the limiter class. SlidingWindowLimiter keeps
+exact timestamps in process memory, so each worker counts on its own.
+CacheSlidingWindowLimiter approximates the window with two fixed buckets in
+the Django cache and is shared by every worker using the same cache.
+"""
+
+import collections
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+class SlidingWindowLimiter:
+    """At most `limit` hits per key in any `window` seconds, in memory."""
+
+    # Idle keys are swept once this many are tracked
+    max_keys = 10000
+
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._hits = {}
+
+    def retry_after(self, key):
+        """Seconds until `key` may try again; 0 if it may now."""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if not hits:
+                return 0
+            self._expire(hits, now)
+            if len(hits) < self.limit:
+                return 0
+            return math.ceil(hits[0] + self.window - now)
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._hits) >= self.max_keys:
+                self._sweep(now)
+            hits = self._hits.setdefault(key, collections.deque())
+            self._expire(hits, now)
+            hits.append(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _expire(self, hits, now):
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+
+    def _sweep(self, now):
+        for key in list(self._hits):
+            hits = self._hits[key]
+            self._expire(hits, now)
+            if not hits:
+                del self._hits[key]
+
+
+class CacheSlidingWindowLimiter:
+    """
+    Sliding-window counter in the shared cache: the previous bucket's count
+    is weighted by how much of it still overlaps the window.
+    """
+
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def retry_after(self, key):
+        now = time.time()
+        bucket = int(now // self.window)
+        counts = cache.get_many([self._key(key, bucket - 1), self._key(key, bucket)])
+        previous = counts.get(self._key(key, bucket - 1), 0)
+        current = counts.get(self._key(key, bucket), 0)
+        elapsed = now / self.window - bucket
+        if previous * (1 - elapsed) + current < self.limit:
+            return 0
+        return math.ceil((bucket + 1) * self.window - now)
+
+    def hit(self, key):
+        bucket_key = self._key(key, int(time.time() // self.window))
+        # Two windows: the bucket is still read as `previous` after it ends
+        cache.add(bucket_key, 0, self.window * 2)
+        try:
+            cache.incr(bucket_key)
+        except ValueError:
+            cache.set(bucket_key, 1, self.window * 2)
+
+    def reset(self, key):
+        bucket = int(time.time() // self.window)
+        cache.delete_many([self._key(key, bucket - 1), self._key(key, bucket)])
+
+    def _key(self, key, bucket):
+        return f"throttle:{self.name}:{key}:{bucket}"
+
+
+_limiters = None
+
+
+def get_limiters():
+    """The (per-IP, per-username) limiters, built from settings once."""
+    global _limiters
+    if _limiters is None:
+        limiter_class = import_string(settings.LOGIN_THROTTLE_BACKEND)
+        window = settings.LOGIN_THROTTLE_WINDOW
+        _limiters = (
+            limiter_class("login-ip", settings.LOGIN_IP_LIMIT, window),
+            limiter_class("login-user", settings.LOGIN_USERNAME_LIMIT, window),
+        )
+    return _limiters
+
+
+def login_retry_after(ip, username):
+    """Seconds the caller must wait before another login attempt, or 0."""
+    by_ip, by_username = get_limiters()
+    return max(by_ip.retry_after(ip), by_username.retry_after(username.lower()))
+
+
+def record_login_failure(ip, username):
+    by_ip, by_username = get_limiters()
+    by_ip.hit(ip)
+    by_username.hit(username.lower())
+
+
+def record_login_success(username):
+    get_limiters()[1].reset(username.lower())
@@ -5,6 +5,7 @@ from .views import (
     UserRegistrationView,
     UserLoginView,
     UserLogoutView,
+    TokenRefreshView,
     UserViewSet,
     LeaderboardView,
     UserPasswordChangeView,
@@ -15,6 +16,7 @@ router.register(r"users", UserViewSet, basename="user")
 
 urlpatterns = [
     path("auth/login/", UserLoginView.as_view(), name="api-login"),
+    path("auth/token/refresh/", TokenRefreshView.as_view(), name="api-token-refresh"),
     path("auth/logout/", UserLogoutView.as_view(), name="api-logout"),
     path("auth/register/", UserRegistrationView.as_view(), name="api-register"),
     path("auth/profile/", UserProfileView.as_view(), name="api-profile"),
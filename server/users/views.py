@@ -1,13 +1,29 @@
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, status, viewsets
+from rest_framework import exceptions, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.throttling import BaseThrottle
 from django.contrib.auth import authenticate, login, logout
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import F, Window, Q
-from django.db.models.functions import RowNumber
+from django.db.models import F, FilteredRelation, Q, Sum, Window
+from django.db.models.functions import Coalesce, Rank
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.utils import timezone
 from django.utils.decorators import method_decorator
+from config.cache import cached_response
+from config.conditional import ConditionalGetMixin, conditional_get, namespace_etag
+from config.facets import FacetsMixin
+from config.sparse import SparseQuerysetMixin
+from config.tags import filter_by_tags, parse_tags
+
+from .models import UserSkill
+from .ranking import entries_around, get_user_rank, top_entries
+from .search import search_users
+from .throttling import login_retry_after, record_login_failure, record_login_success
+from .tokens import InvalidToken, issue_tokens, refresh_tokens
 from .serializers import (
     UserSerializer,
     UserProfileUpdateSerializer,
@@ -18,23 +34,19 @@ from .serializers import (
 
 User = get_user_model()
 
-
-import logging
-import traceback
-from django.db import connections
-from django.db.utils import OperationalError
-
 logger = logging.getLogger(__name__)
 
-@method_decorator(csrf_exempt, name='dispatch')
-@method_decorator(ensure_csrf_cookie, name='dispatch')
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(ensure_csrf_cookie, name="dispatch")
 class UserLoginView(APIView):
     """
     Login endpoint for session authentication.
-    Returns 400 for invalid credentials, 404 for missing user, 500 for server errors.
+    Returns 400 for invalid credentials and 429 while throttled.
     CSRF is explicitly exempted here because the browser may not have a CSRF cookie
     on first visit. ensure_csrf_cookie sets the cookie so subsequent requests work.
     """
+
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
@@ -46,59 +58,55 @@ class UserLoginView(APIView):
                 {"detail": "Username and password are required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if not isinstance(username, str) or not isinstance(password, str):
+            return Response(
+                {"detail": "Username and password must be strings"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        try:
-            # 1. Verify database connection
-            db_conn = connections['default']
-            try:
-                db_conn.cursor()
-            except OperationalError:
-                logger.error("Database connection failure before login")
-                return Response(
-                    {"detail": "Database connection unavailable"},
-                    status=status.HTTP_503_SERVICE_UNAVAILABLE
-                )
+        # Refuse throttled callers before any password is hashed
+        ip = BaseThrottle().get_ident(request)
+        wait = login_retry_after(ip, username)
+        if wait:
+            logger.warning("Throttled login attempt for %s from %s", username, ip)
+            raise exceptions.Throttled(wait=wait)
+
+        # One user query; unknown usernames still run a dummy hash so
+        # response times don't reveal which accounts exist
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            record_login_failure(ip, username)
+            logger.warning("Invalid credentials for user: %s", username)
+            return Response(
+                {"detail": "Invalid credentials"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            # 2. Safe User lookup
-            user_exists = User.objects.filter(username=username).exists()
-            if not user_exists:
-                logger.warning(f"Login attempt for non-existent user: {username}")
-                return Response(
-                    {"detail": "User not found"},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+        record_login_success(username)
+        login(request, user)
+        logger.info("Successful login for user: %s", username)
+        return Response(
+            {
+                "detail": "Login successful",
+                "user": UserSerializer(user).data,
+                "tokens": issue_tokens(user),
+            },
+            status=status.HTTP_200_OK,
+        )
 
-            # 3. Authenticate (includes password check)
-            user = authenticate(request, username=username, password=password)
 
-            if user is not None:
-                login(request, user)
-                serializer = UserSerializer(user)
-                logger.info(f"Successful login for user: {username}")
-                return Response(
-                    {"detail": "Login successful", "user": serializer.data},
-                    status=status.HTTP_200_OK,
-                )
-            else:
-                logger.warning(f"Invalid credentials for user: {username}")
-                return Response(
-                    {"detail": "Invalid credentials"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+class TokenRefreshView(APIView):
+    """Exchange a refresh token for a new access/refresh pair"""
 
-        except Exception as e:
-            # 4. Print exact stack trace and return JSON
-            error_trace = traceback.format_exc()
-            print(f"CRITICAL: Login failure for {username}:\n{error_trace}")
-            logger.error(f"Login exception for {username}: {str(e)}", exc_info=True)
-            return Response(
-                {
-                    "detail": "An unexpected server error occurred",
-                    "error": str(e),
-                    "trace": error_trace if settings.DEBUG else None
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        try:
+            tokens = refresh_tokens(str(request.data.get("refresh", "")))
+        except InvalidToken as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(tokens)
 
 
 class UserLogoutView(APIView):
@@ -120,14 +128,16 @@ class UserProfileView(APIView):
         serializer = UserSerializer(request.user)
         data = serializer.data
 
-        # Calculate Rank
-        # Rank is based on points, for active members
-        rank = (
-            User.objects.filter(
-                is_active=True, is_member=True, points__gt=request.user.points
-            ).count()
-            + 1
-        )
+        # Rank comes from the materialized leaderboard; non-members are not
+        # ranked there, so fall back to counting members ahead of them
+        rank = get_user_rank(request.user)
+        if rank is None:
+            rank = (
+                User.objects.filter(
+                    is_active=True, is_member=True, points__gt=request.user.points
+                ).count()
+                + 1
+            )
         data["rank"] = rank
 
         # Calculate Attendance
@@ -205,7 +215,9 @@ class IsClubAdmin(permissions.BasePermission):
         return request.user and (request.user.is_club_admin or request.user.is_staff)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    FacetsMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for viewing and editing users.
     Admins can see/edit all users, regular users can see members only.
@@ -213,6 +225,18 @@ class UserViewSet(viewsets.ModelViewSet):
 
     queryset = User.objects.filter(is_active=True)
     serializer_class = UserSerializer
+    etag_namespaces = ("users",)
+    facet_fields = ("batch_year", "skill_level")
+    facets_namespace = "users"
+
+    @property
+    def cursor_ordering(self):
+        if self.action == "attendance":
+            return ("-marked_at", "-pk")
+        # Search results page by relevance (see users.search)
+        if self.action == "list" and self.request.query_params.get("search"):
+            return ("-search_key",)
+        return ("-created_at", "-pk")
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
@@ -236,18 +260,35 @@ class UserViewSet(viewsets.ModelViewSet):
         if skill:
             queryset = queryset.filter(skill_level=skill)
 
-        # Search by name or username
+        # Filter by skills: ?tech=python, or ?skills=python,django with
+        # ?skills_match=all to require every one (default: any)
+        skills = parse_tags(self.request.query_params.get("skills"))
+        skills += parse_tags(self.request.query_params.get("tech"))
+        if skills:
+            queryset = filter_by_tags(
+                queryset,
+                "tech_skills",
+                UserSkill,
+                "user",
+                skills,
+                match_all=self.request.query_params.get("skills_match") == "all",
+            )
+
+        # Ranked, indexed search by name, username or email (see users.search)
         search = self.request.query_params.get("search", None)
         if search:
-            queryset = queryset.filter(
-                Q(username__icontains=search)
-                | Q(first_name__icontains=search)
-                | Q(last_name__icontains=search)
-                | Q(email__icontains=search)
-            )
+            return search_users(queryset, search).order_by("-search_key")
 
         return queryset.order_by("-created_at")
 
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=["get"])
     def projects(self, request, pk=None):
         """Get user's projects"""
@@ -255,12 +296,15 @@ class UserViewSet(viewsets.ModelViewSet):
         from club.serializers import ProjectSerializer
 
         user = self.get_object()
-        projects = Project.objects.filter(
-            Q(lead=user) | Q(contributors=user)
-        ).distinct()
+        projects = (
+            Project.objects.with_contributor_count()
+            .filter(Q(lead=user) | Q(contributors=user))
+            .select_related("lead")
+            .prefetch_related("contributors")
+            .distinct()
+        )
 
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(ProjectSerializer, projects)
 
     @action(detail=True, methods=["get"])
     def tasks(self, request, pk=None):
@@ -280,8 +324,7 @@ class UserViewSet(viewsets.ModelViewSet):
             )
 
         tasks = Task.objects.filter(assigned_to=user)
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(TaskSerializer, tasks)
 
     @action(detail=True, methods=["get"])
     def attendance(self, request, pk=None):
@@ -301,8 +344,17 @@ class UserViewSet(viewsets.ModelViewSet):
             )
 
         attendances = Attendance.objects.filter(user=user).select_related("event")
-        serializer = AttendanceSerializer(attendances, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(AttendanceSerializer, attendances)
+
+    def paginated_response(self, serializer_class, queryset):
+        """A page of `queryset`, ordered like the list (see cursor_ordering)."""
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer_class(page, many=True, context=context).data
+            )
+        return Response(serializer_class(queryset, many=True, context=context).data)
 
 
 class LeaderboardView(APIView):
@@ -310,88 +362,121 @@ class LeaderboardView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
 
+    # Results announcements send everyone here at once; only one worker
+    # recomputes an expired page (see config.cache.get_or_compute)
+    def get_etag(self, request):
+        # Every award, rank rebuild and membership change bumps the cache
+        # namespace version; the date matters because period windows move
+        return namespace_etag(
+            ("leaderboard",),
+            request.get_full_path(),
+            request.user.pk,
+            timezone.localdate(),
+        )
+
+    @conditional_get
+    @cached_response(
+        "leaderboard",
+        timeout=settings.LEADERBOARD_CACHE_TIMEOUT,
+        vary_on_user=lambda request: "around" in request.query_params,
+    )
     def get(self, request):
-        from django.db.models import Sum, Count, Case, When, IntegerField
-        from django.utils import timezone
         import datetime
 
-        limit = int(request.query_params.get("limit", 50))
+        from django.utils.dateparse import parse_date
+
+        try:
+            limit = int(request.query_params.get("limit", 50))
+        except ValueError:
+            limit = 50
+        limit = max(1, min(limit, settings.LEADERBOARD_MAX_LIMIT))
         period = request.query_params.get("period", "all_time")
+        # Explicit ?from=&to= dates win over the named period
+        date_range = "from" in request.query_params or "to" in request.query_params
+
+        # Optional segment: rank within a batch year and/or skill level
+        segment = {}
+        if request.query_params.get("batch_year"):
+            try:
+                segment["batch_year"] = int(request.query_params["batch_year"])
+            except ValueError:
+                return Response(
+                    {"detail": "batch_year must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if request.query_params.get("skill_level"):
+            segment["skill_level"] = request.query_params["skill_level"]
+
+        around_me = request.query_params.get("around") == "me"
+
+        if period == "all_time" and not date_range:
+            # Read the materialized rank table (see users.ranking)
+            if around_me:
+                try:
+                    window = int(request.query_params.get("window", 5))
+                except ValueError:
+                    window = 5
+                window = max(0, min(window, settings.LEADERBOARD_MAX_LIMIT // 2))
+                entries = entries_around(request.user, window, **segment)
+            else:
+                entries = top_entries(limit, **segment)
 
-        queryset = User.objects.filter(is_active=True, is_member=True)
+            users = []
+            for entry in entries:
+                entry.user.rank = entry.rank
+                users.append(entry.user)
 
-        if period == "all_time":
-            # Just use the total points field
-            users = queryset.order_by("-points")[:limit]
-            # Since serializer expects 'points', the model field works fine.
-            # But let's verify if we need to return 'rank' as well.
-            # The original implementation used Window functions which is good for ranking.
-            users = queryset.annotate(
-                rank=Window(expression=RowNumber(), order_by=F("points").desc())
-            ).order_by("-points")[:limit]
+        elif around_me:
+            return Response(
+                {"detail": "around=me is only supported for the all_time leaderboard"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         else:
-            # Calculate start date based on period
-            now = timezone.now()
-            start_date = now
-            if period == "weekly":
-                start_date = now - datetime.timedelta(days=7)
-            elif period == "monthly":
-                start_date = now - datetime.timedelta(days=30)
-
-            # Aggregate points from Tasks and Attendance
-            # Task: status='verified' (or 'submitted' depending on logic)
-            # Attendance: status='present' (assuming 10 points per attendance, need to verify or assume)
-
-            # Note: Task model has `points`. Attendance does not have a points field in the model shown earlier.
-            # Assuming a fixed value for attendance, e.g., 5 points.
-            ATTENDANCE_POINTS = 5
-
-            # Better approach for Coalesce
-            from django.db.models.functions import Coalesce
-
-            users = (
-                queryset.annotate(
-                    task_points=Coalesce(
-                        Sum(
-                            Case(
-                                When(
-                                    tasks__updated_at__gte=start_date,
-                                    tasks__status__in=["verified", "submitted"],
-                                    then="tasks__points",
-                                ),
-                                default=0,
-                                output_field=IntegerField(),
-                            )
-                        ),
-                        0,
-                    ),
-                    attendance_points=Coalesce(
-                        Count(
-                            Case(
-                                When(
-                                    attendances__marked_at__gte=start_date,
-                                    attendances__status="present",
-                                    then=1,
-                                ),
-                                output_field=IntegerField(),
-                            )
-                        ),
-                        0,
+            today = timezone.localdate()
+            if date_range:
+                try:
+                    start_date = parse_date(request.query_params.get("from", ""))
+                    end_date = parse_date(request.query_params.get("to", ""))
+                except ValueError:
+                    start_date = end_date = None
+                if not start_date or not end_date or start_date > end_date:
+                    return Response(
+                        {"detail": "from and to must be valid dates (YYYY-MM-DD)"},
+                        status=status.HTTP_400_BAD_REQUEST,
                     )
-                    * ATTENDANCE_POINTS,
+            elif period in ("weekly", "monthly"):
+                # The last 7 or 30 days, today included
+                days = 7 if period == "weekly" else 30
+                start_date = today - datetime.timedelta(days=days - 1)
+                end_date = today
+            else:
+                return Response(
+                    {"detail": "period must be all_time, weekly or monthly"},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
-                .annotate(period_points=F("task_points") + F("attendance_points"))
+
+            # Left-join each member's daily rollup rows in [start, end + 1):
+            # at most one row per member per day, and members who earned
+            # nothing in the window still rank, with 0 points
+            in_window = Q(
+                daily_points__day__gte=start_date,
+                daily_points__day__lt=end_date + datetime.timedelta(days=1),
+            )
+            users = list(
+                User.objects.filter(is_active=True, is_member=True, **segment)
+                .annotate(window=FilteredRelation("daily_points", condition=in_window))
+                .annotate(period_points=Coalesce(Sum("window__points"), 0))
                 .annotate(
-                    rank=Window(
-                        expression=RowNumber(), order_by=F("period_points").desc()
-                    )
+                    rank=Window(expression=Rank(), order_by=F("period_points").desc())
                 )
-                .order_by("-period_points")[:limit]
+                .order_by("-period_points", "id")[:limit]
             )
-
-            # Override points for serialization
             for user in users:
+                # Override points for serialization
                 user.points = user.period_points
 
-        return Response(LeaderboardSerializer(users, many=True).data)
+        serializer = LeaderboardSerializer(
+            users, many=True, context={"request": request}
+        )
+        return Response(serializer.data)